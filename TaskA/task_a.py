@@ -24,6 +24,11 @@ Email: anna.virtanen@example.com
 """
 
 from datetime import datetime
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from fi_format import format_date, format_number, format_time
 
 def main():
     # Define the file name directly in the code
@@ -39,15 +44,15 @@ def main():
     booker = reservation.split('|')[1]
     print("Booker:", booker)
     date = datetime.strptime(reservation.split('|')[2], "%Y-%m-%d").date()
-    print("Date:", date.strftime("%d.%m.%Y"))
+    print("Date:", format_date(date))
     start_time = datetime.strptime(reservation.split('|')[3], "%H:%M").time()
-    print("Start time:", start_time.strftime("%H.%M"))
+    print("Start time:", format_time(start_time))
     number_of_hours = int(reservation.split('|')[4])
     print("Number of hours:", number_of_hours)
     hourly_price = float(reservation.split('|')[5])
-    print("Hourly price:", f"{hourly_price:.2f}".replace('.', ','), "€")
+    print("Hourly price:", format_number(hourly_price), "€")
     total_price = hourly_price*number_of_hours
-    print("Total price:", f"{total_price:.2f}".replace('.', ','), "€")
+    print("Total price:", format_number(total_price), "€")
     paid = reservation.split('|')[6]
     print(f"Paid: {'Yes' if paid else 'No'}")
     location = reservation.split('|')[7]
@@ -24,6 +24,11 @@ Email: anna.virtanen@example.com
 
 """
 from datetime import datetime
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from fi_format import format_date, format_number, format_time
 
 def print_reservation_number(reservation: list) -> None:
     """
@@ -53,7 +58,7 @@ def print_date(reservation: list) -> None:
      reservation (lst): reservation -> columns separated by |
     """
     date = datetime.strptime(reservation[2], "%Y-%m-%d").date()
-    finnish_date = date.strftime("%d.%m.%Y")
+    finnish_date = format_date(date)
     print(f"Date: {finnish_date}")
 
 def print_start_time(reservation: list) -> None:
@@ -64,7 +69,7 @@ def print_start_time(reservation: list) -> None:
      reservation (lst): reservation -> columns separated by |
     """
     start_time = datetime.strptime(reservation[3], "%H:%M").time()
-    finnish_time = start_time.strftime("%H.%M")
+    finnish_time = format_time(start_time)
     print(f"Start time: {finnish_time}")
 
 def print_hours(reservation: list) -> None:
@@ -85,7 +90,7 @@ def print_hourly_rate(reservation: list) -> None:
      reservation (lst): reservation -> columns separated by |
     """
     hourly_rate = float(reservation[5])
-    print(f"Hourly rate: {hourly_rate:.2f}".replace('.', ','), "€")
+    print(f"Hourly rate: {format_number(hourly_rate)}", "€")
 
 def print_total_price(reservation: list) -> None:
     """
@@ -95,7 +100,7 @@ def print_total_price(reservation: list) -> None:
      reservation (lst): reservation -> columns separated by |
     """
     total_price = int(reservation[4]) * float(reservation[5])
-    print(f"Total price: {total_price:.2f}".replace('.', ','), "€")
+    print(f"Total price: {format_number(total_price)}", "€")
 
 def print_paid(reservation: list) -> None:
     """
@@ -19,6 +19,13 @@ int | str | str | str | date | time | int | float | bool | str | datetime
 """
 
 from datetime import datetime
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from compressed_io import open_text
+from quarantine import ROW_ERRORS, Quarantine
+from fi_format import format_date, format_number, format_time
 
 
 def convert_reservation_data(reservation: list) -> list:
@@ -48,13 +55,14 @@ def convert_reservation_data(reservation: list) -> list:
     return converted
 
 
-def fetch_reservations(reservation_file: str) -> list[list]:
+def fetch_reservations(reservation_file: str, quarantine: Quarantine = None) -> list[list]:
     """
     Reads reservations from a file and returns the reservations converted
     You don't need to modify this function!
 
     Parameters:
      reservation_file (str): Name of the file containing the reservations
+     quarantine (Quarantine): Lenient mode, bad rows are written here instead of raising
 
     Returns:
      reservations (list): Read and converted reservations
@@ -75,11 +83,17 @@ def fetch_reservations(reservation_file: str) -> list[list]:
             "createdAt",
         ]
     )
-    with open(reservation_file, "r", encoding="utf-8") as f:
-        for line in f:
+    with open_text(reservation_file, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
             if len(line) > 1:
                 fields = line.split("|")
-                reservations.append(convert_reservation_data(fields))
+                try:
+                    reservations.append(convert_reservation_data(fields))
+                except ROW_ERRORS as e:
+                    # Lenient mode: set the row aside and continue
+                    if quarantine is None:
+                        raise
+                    quarantine.add(line_number, line, e)
     return reservations
 
 def confirmed_reservations(reservations: list[list]) -> None:
@@ -91,7 +105,7 @@ def confirmed_reservations(reservations: list[list]) -> None:
     """
     for reservation in reservations[1:]:
         if reservation[8]: # If confirmed
-            print(f'- {reservation[1]}, {reservation[-2]}, {reservation[4].strftime("%d.%m.%Y")} at {reservation[5].strftime("%H.%M")}')
+            print(f'- {reservation[1]}, {reservation[-2]}, {format_date(reservation[4])} at {format_time(reservation[5])}')
 
 def long_reservations(reservations : list[list]) -> None:
     """
@@ -102,7 +116,7 @@ def long_reservations(reservations : list[list]) -> None:
     """
     for reservation in reservations[1:]:
         if reservation[6] >= 3: # If long
-            print(f'- {reservation[1]}, {reservation[4].strftime("%d.%m.%Y")} at {reservation[5].strftime("%H.%M")}, duration {reservation[6]} h, {reservation[-2]}')
+            print(f'- {reservation[1]}, {format_date(reservation[4])} at {format_time(reservation[5])}, duration {reservation[6]} h, {reservation[-2]}')
 
 
 def confirmation_statuses(reservations: list[list]) -> None:
@@ -136,7 +150,7 @@ def total_revenue(reservations: list[list]) -> None:
      reservations (list): Reservations
     """
     revenue : float = sum([x[6] * x[7] for x in reservations[1:] if x[8]])
-    print(f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace('.', ','))
+    print(f'Total revenue from confirmed reservations: {format_number(revenue)} €')
 
 def main():
     """
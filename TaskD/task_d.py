@@ -1,15 +1,22 @@
 # Copyright (c) 2025 Luukas Kola and Luka Hietala
 # License: MIT
-import types
-import importlib
 from datetime import datetime
 import csv
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))
+from compressed_io import open_text
+from quarantine import ROW_ERRORS, Quarantine
+from fi_format import format_date, format_rows, format_weekday
 
-def read_data(filename: str) -> (list[str], list[list[str]]):
+def read_data(filename: str, quarantine: Quarantine = None) -> (list[str], list[list[str]]):
     """
     Reads the CSV file and returns the rows in a suitable structure.
 
     :filename: Name of file
+    :quarantine: Lenient mode, rows that would not convert are written here
+    and left out instead of failing later in format_data
     :returns:
         :fields: Column headers in CSV
         :rows: Rows in CSV
@@ -20,10 +27,17 @@ def read_data(filename: str) -> (list[str], list[list[str]]):
     # Row data
     rows : list[list[str]] = []
     
-    with open(filename, newline='') as csvfile:
+    with open_text(filename, newline='') as csvfile:
         reader = csv.reader(csvfile, delimiter=';')
         fields = next(reader)
         for row in reader:
+            if quarantine is not None:
+                try:
+                    datetime.strptime(row[0], "%Y-%m-%dT%H:%M:%S")
+                    [float(row[column]) for column in range(1, 7)]
+                except ROW_ERRORS as e:
+                    quarantine.add(reader.line_num, ';'.join(row), e)
+                    continue
             rows.append(row)
 
     return fields, rows
@@ -68,11 +82,10 @@ def print_data(titles : list[str], data : dict[datetime.date, dict[str, float]])
     header = "\t".join(titles)
     print(header)
     # Print data
-    paivat : list[str] = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai", "Lauantai", "Sunnuntai"]
-    for day, data in data.items():
-        paiva : str = paivat[day.weekday()]
-        date_str : str = day.strftime("%d.%m.%Y")
-        print(f'{paiva} \t{date_str} {f'\t{data['C1']:.2f}\t{data['C2']:.2f}\t{data['C3']:.2f}\t{data['P1']:.2f}\t{data['P2']:.2f}\t{data['P3']:.2f}'.replace('.',',')}')
+    # Columns in the order format_data (or format_net_data) created them
+    cells : list[str] = format_rows(values.values() for values in data.values())
+    for day, row in zip(data, cells):
+        print(f'{format_weekday(day)} \t{format_date(day)} \t{row}')
 
 def main() -> None:
     """
@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Luukas Kola and Luka Hietala
+# License: MIT
+"""
+Benchmark: building the daily table of result_data with per-row strftime,
+weekday lookup and per-row replace, against fi_format. Also single prices
+formatted per reservation line, as the TaskC/TaskG reports do.
+
+Run: python bench_format.py [days]
+"""
+from datetime import date, timedelta
+import os
+import random
+import sys
+import time
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))
+from fi_format import format_date, format_number, format_rows, format_weekday, precompute_dates
+
+def old_table(data: dict[date, dict[str, float]]) -> str:
+    """The table as result_data built it before fi_format."""
+    result: str = ""
+    paivat: list[str] = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai", "Lauantai", "Sunnuntai"]
+    for day, values in data.items():
+        paiva: str = paivat[day.weekday()]
+        date_str: str = day.strftime("%d.%m.%Y")
+        cells: str = ''.join(f'\t{value:.2f}' for value in values.values()).replace('.', ',')
+        result += f'{paiva} \t{date_str} {cells}\n'
+    return result
+
+def new_table(data: dict[date, dict[str, float]]) -> str:
+    """The table as result_data builds it with fi_format."""
+    cells: list[str] = format_rows(values.values() for values in data.values())
+    return ''.join([f'{format_weekday(day)} \t{format_date(day)} \t{row}\n' for day, row in zip(data, cells)])
+
+def make_data(days: int) -> dict[date, dict[str, float]]:
+    """Random daily values in the format_data structure."""
+    first: date = date(2000, 1, 1)
+    return {first + timedelta(days=i): {key: random.uniform(0, 20) for key in ('C1', 'C2', 'C3', 'P1', 'P2', 'P3')}
+            for i in range(days)}
+
+def old_prices(prices: list[float]) -> list[str]:
+    """Prices formatted with an f-string and replace, one at a time."""
+    return [f'{price:.2f}'.replace('.', ',') for price in prices]
+
+def new_prices(prices: list[float]) -> list[str]:
+    """Prices formatted with fi_format.format_number, one at a time."""
+    return [format_number(price) for price in prices]
+
+def timed(function, data) -> float:
+    """Best of five runs in seconds."""
+    best: float = float('inf')
+    for _ in range(5):
+        start: float = time.perf_counter()
+        function(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    """Prints timings and checks that both produce the same table."""
+    days: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data: dict[date, dict[str, float]] = make_data(days)
+    assert old_table(data) == new_table(data)
+    old: float = timed(old_table, data)
+    precompute_dates(min(data), max(data))
+    new: float = timed(new_table, data)
+    print(f'{days} rows: strftime + replace {old:.3f} s, fi_format {new:.3f} s, {old / new:.1f}x')
+    # Reservation prices come from a short price list
+    prices: list[float] = [random.choice([10.0, 12.5, 18.5, 19.95, 22.75, 35.9]) * random.randint(1, 8) for _ in range(days)]
+    assert old_prices(prices) == new_prices(prices)
+    old = timed(old_prices, prices)
+    new = timed(new_prices, prices)
+    print(f'{days} prices: f-string + replace {old:.3f} s, format_number {new:.3f} s, {old / new:.1f}x')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# Copyright (c) 2025 Luukas Kola and Luka Hietala
+# License: MIT
+"""
+Checks merge_data against the unmerged files: merging a week with itself (a
+re-export) or with the other weeks must give the same daily totals as reading
+it alone, including the hour repeated when DST ends in week43.
+
+Run: python check_merge.py
+"""
+from task_e import format_data, merge_data, stream_data
+
+WEEKS: list[str] = ['week41.csv', 'week42.csv', 'week43.csv']
+
+def main() -> None:
+    """Compares the daily totals of every week, merged and unmerged."""
+    unmerged : dict = format_data(row for week in WEEKS for row in stream_data(week))
+    for files in [[week] for week in WEEKS] + [[week, week] for week in WEEKS] + [WEEKS, WEEKS[::-1] + WEEKS]:
+        merged : dict = format_data(merge_data(files))
+        expected : dict = {day: unmerged[day] for day in merged}
+        assert merged == expected, f'merging {", ".join(files)} changes the daily totals'
+        assert len(merged) == 7 * len(set(files)), f'merging {", ".join(files)} loses days'
+    print('merged totals equal the unmerged ones')
+
+if __name__ == "__main__":
+    main()
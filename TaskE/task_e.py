@@ -1,15 +1,24 @@
 # Copyright (c) 2025 Luukas Kola and Luka Hietala
 # License: MIT
-import types
-import importlib
+from collections.abc import Iterator
 from datetime import datetime
 import csv
+import heapq
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))
+from compressed_io import open_text
+from quarantine import ROW_ERRORS, Quarantine
+from fi_format import format_date, format_rows, format_weekday
 
-def read_data(filename: str) -> (list[str], list[list[str]]):
+def read_data(filename: str, quarantine: Quarantine = None) -> (list[str], list[list[str]]):
     """
     Reads the CSV file and returns the rows in a suitable structure.
 
     :filename: Name of file
+    :quarantine: Lenient mode, rows that would not convert are written here
+    and left out instead of failing later in format_data
     :returns:
         :fields: Column headers in CSV
         :rows: Rows in CSV
@@ -20,14 +29,76 @@ def read_data(filename: str) -> (list[str], list[list[str]]):
     # Row data
     rows : list[list[str]] = []
     
-    with open(filename, newline='') as csvfile:
+    with open_text(filename, newline='') as csvfile:
         reader = csv.reader(csvfile, delimiter=';')
         fields = next(reader)
         for row in reader:
+            if quarantine is not None:
+                try:
+                    datetime.strptime(row[0], "%Y-%m-%dT%H:%M:%S")
+                    [float(row[column]) for column in range(1, 7)]
+                except ROW_ERRORS as e:
+                    quarantine.add(reader.line_num, ';'.join(row), e)
+                    continue
             rows.append(row)
 
     return fields, rows
 
+def stream_data(filename: str) -> Iterator[list[str]]:
+    """
+    Reads the CSV file one row at a time, skipping the header.
+
+    :filename: Name of file
+    :returns: Iterator over rows in CSV
+    """
+    with open_text(filename, newline='') as csvfile:
+        reader = csv.reader(csvfile, delimiter=';')
+        next(reader)
+        for row in reader:
+            if row:
+                yield row
+
+def numbered_rows(filename: str) -> Iterator[tuple[str, int, list[str]]]:
+    """
+    Reads the rows of a CSV file with the occurrence of their timestamp in the file.
+
+    The local hour repeated when DST ends appears twice with the same timestamp,
+    the first copy gets occurrence 0 and the second 1.
+
+    :filename: Name of file
+    :returns: Iterator over (timestamp, occurrence, row)
+    """
+    previous : str = None
+    occurrence : int = 0
+    for row in stream_data(filename):
+        occurrence = occurrence + 1 if row[0] == previous else 0
+        previous = row[0]
+        yield row[0], occurrence, row
+
+def merge_data(filenames: list[str]) -> Iterator[list[str]]:
+    """
+    Merges CSV files, each sorted by time, into one time ordered stream of rows.
+
+    Files may overlap and come in any order. Only one row per file is held in
+    memory at a time. When several files have the same timestamp, the row from
+    the file listed last wins, so re-exports should be listed after the originals.
+    Rows are matched on the timestamp and its occurrence in the file, so the
+    hour a file repeats when DST ends is kept twice.
+
+    :filenames: Names of the files
+    :returns: Iterator over rows, usable as rows for format_data
+    """
+    merged : Iterator[tuple[str, int, list[str]]] = heapq.merge(*[numbered_rows(filename) for filename in filenames],
+                                                               key=lambda item: item[:2])
+    previous : tuple[str, int, list[str]] = None
+    for item in merged:
+        # heapq.merge keeps equal keys in file order, yield the last of them
+        if previous is not None and item[:2] != previous[:2]:
+            yield previous[2]
+        previous = item
+    if previous is not None:
+        yield previous[2]
+
 def format_data(rows: list[str]) -> dict[datetime.date, dict[str, float]]:
     """
     Does calculations and formats csv data into dictionary
@@ -69,11 +140,9 @@ def result_data(titles : list[str], data : dict[datetime.date, dict[str, float]]
     header = "\t".join(titles) + "\n"
     result += header
     # Print data
-    paivat : list[str] = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai", "Lauantai", "Sunnuntai"]
-    for day, data in data.items():
-        paiva : str = paivat[day.weekday()]
-        date_str : str = day.strftime("%d.%m.%Y")
-        result += f'{paiva} \t{date_str} {f'\t{data['C1']:.2f}\t{data['C2']:.2f}\t{data['C3']:.2f}\t{data['P1']:.2f}\t{data['P2']:.2f}\t{data['P3']:.2f}'.replace('.',',')}\n'
+    # Columns in the order format_data (or format_net_data) created them
+    cells : list[str] = format_rows(values.values() for values in data.values())
+    result += ''.join([f'{format_weekday(day)} \t{format_date(day)} \t{row}\n' for day, row in zip(data, cells)])
     return result
 
 def write_summary(result: str) -> None:
@@ -83,20 +152,30 @@ def write_summary(result: str) -> None:
     with open("summary.txt", "w") as f:
         f.write(result)
 
-def main() -> None:
+def summarise(weeks: list[str]) -> str:
     """
-    Main function: reads data, computes daily totals, and prints the report.
+    Builds the summary of weekly files, one titled table per file
+
+    :weeks: Names of the weekly CSV files
+    :returns: Summary text
     """
     summary : str = ""
-    for week in ['week41.csv', 'week42.csv', 'week43.csv']:
+    for week in weeks:
         fields, rows = read_data(week)
         # Title
-        summary += week.split('.csv')[0].title() + ' electricity consumption and production (kWh, by phase)\n'
+        summary += os.path.basename(week).split('.csv')[0].title() + ' electricity consumption and production (kWh, by phase)\n'
         # summary += ''.join([char.upper() if index==0 else char for index, char in enumerate(week.split('.csv')[0])]) + '\n'
         # Convert CSV data into desired format
         formatted_data = format_data(rows)
         # Format formatted data as table
         summary += result_data(fields, formatted_data)
+    return summary
+
+def main() -> None:
+    """
+    Main function: reads data, computes daily totals, and prints the report.
+    """
+    summary : str = summarise(['week41.csv', 'week42.csv', 'week43.csv'])
     # Write summary to file
     write_summary(summary)
 
@@ -0,0 +1,69 @@
+# Copyright (c) 2026 Luukas Kola
+# License: MIT
+"""
+Benchmark: reading compressed 2025.csv through compressed_io (threaded
+decompression while parsing) against decompressing to disk first and
+then parsing the plain file.
+
+Run: python bench_compressed.py [copies]
+"""
+from collections.abc import Callable
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import time
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))
+from compressed_io import detect_opener
+from task_f import read_data
+
+COMPRESSORS: dict[str, Callable] = {'gz': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+def make_input(folder: str, copies: int) -> str:
+    """Writes 2025.csv repeated copies times (one header) into folder."""
+    path: str = os.path.join(folder, 'big.csv')
+    with open('2025.csv') as src:
+        header: str = src.readline()
+        # The file has no newline at the end
+        body: str = src.read().rstrip('\n') + '\n'
+    with open(path, 'w') as f:
+        f.write(header)
+        for _ in range(copies):
+            f.write(body)
+    return path
+
+def timed(function: Callable) -> float:
+    """Returns how many seconds calling function took."""
+    start: float = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def via_disk(compressed: str, folder: str) -> None:
+    """Decompresses to a temporary file, then parses it."""
+    plain: str = os.path.join(folder, 'plain.csv')
+    with detect_opener(compressed)(compressed, 'rb') as src, open(plain, 'wb') as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    read_data(plain)
+    os.remove(plain)
+
+def main() -> None:
+    """Prints timings for each compression format."""
+    copies: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as folder:
+        plain: str = make_input(folder, copies)
+        print(f'{copies} x 2025.csv, {os.path.getsize(plain) / 1e6:.1f} MB')
+        print(f'plain: {timed(lambda: read_data(plain)):.2f} s')
+        for suffix, compressor in COMPRESSORS.items():
+            compressed: str = f'{plain}.{suffix}'
+            with open(plain, 'rb') as src, compressor(compressed, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            disk: float = timed(lambda: via_disk(compressed, folder))
+            threaded: float = timed(lambda: read_data(compressed))
+            print(f'{suffix}: decompress to disk + parse {disk:.2f} s, threaded {threaded:.2f} s')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Copyright (c) 2026 Luukas Kola
+# License: MIT
+from collections.abc import Callable
+from datetime import datetime
+import numpy as np
+
+# Example time-of-use tariff (c/kWh added on top of the spot price):
+# daytime transfer on weekdays in winter months is more expensive
+EXAMPLE_TARIFF: list[dict] = [
+    {'price': 2.59},
+    {'months': [1, 2, 3, 11, 12], 'weekdays': [0, 1, 2, 3, 4], 'hours': range(7, 22), 'price': 6.16},
+]
+
+def read_hourly(filename: str, column: int = 1) -> dict[str, np.ndarray]:
+    """Reads one value column of an hourly CSV (2025.csv timestamp format) into arrays."""
+    local: list[str] = []
+    offsets: list[int] = []
+    values: list[str] = []
+    with open(filename) as f:
+        for line in f.read().splitlines()[1:]:
+            fields: list[str] = line.split(';')
+            # 2025-01-01T00:00:00.000+02:00 -> local time and offset in hours
+            stamp: str = fields[0].strip()
+            local.append(stamp[:19])
+            offsets.append(int(stamp[-6:-3]))
+            values.append(fields[column].replace(',', '.'))
+    series: dict[str, np.ndarray] = {}
+    series['local'] = np.array(local, dtype='datetime64[h]')
+    # UTC hour numbers are unique also during the autumn DST change
+    series['utc'] = series['local'].astype(np.int64) - np.array(offsets, dtype=np.int64)
+    series['values'] = np.array(values, dtype=np.float64)
+    return series
+
+def align(prices: dict[str, np.ndarray], utc: np.ndarray) -> np.ndarray:
+    """Returns the price of every hour in utc, raises ValueError if an hour has no price."""
+    order: np.ndarray = np.argsort(prices['utc'], kind='stable')
+    sorted_utc: np.ndarray = prices['utc'][order]
+    index: np.ndarray = np.clip(np.searchsorted(sorted_utc, utc), 0, len(sorted_utc) - 1)
+    missing: np.ndarray = sorted_utc[index] != utc
+    if missing.any():
+        first: np.datetime64 = np.datetime64(int(utc[missing][0]), 'h')
+        raise ValueError(f'No price for {missing.sum()} hours, first at {first} UTC')
+    return prices['values'][order][index]
+
+def tariff_prices(local: np.ndarray, tariff: list[dict]) -> np.ndarray:
+    """
+    Evaluates time-of-use rules for every hour. Rules may limit months (1-12),
+    weekdays (0 = Monday) and hours (0-23); a later matching rule overrides an earlier one.
+    """
+    days: np.ndarray = local.astype('datetime64[D]')
+    fields: dict[str, np.ndarray] = {
+        'months': local.astype('datetime64[M]').astype(np.int64) % 12 + 1,
+        # 1970-01-01 was a Thursday
+        'weekdays': (days.astype(np.int64) + 3) % 7,
+        'hours': (local - days).astype(np.int64),
+    }
+    result: np.ndarray = np.zeros(len(local))
+    for rule in tariff:
+        mask: np.ndarray = np.ones(len(local), dtype=bool)
+        for key, values in fields.items():
+            if key in rule:
+                mask &= np.isin(values, list(rule[key]))
+        result[mask] = rule['price']
+    return result
+
+def hourly_costs(consumption: dict[str, np.ndarray], prices: dict[str, np.ndarray],
+                 tariff: list[dict] | None = None, meters: np.ndarray | None = None) -> dict[str, np.ndarray]:
+    """
+    Joins consumption with spot prices and tariff by hour. Prices are c/kWh, costs euros.
+
+    consumption is a series from read_hourly; meters optionally replaces its values
+    with a (meters, hours) array on the same hours.
+    """
+    unit: np.ndarray = align(prices, consumption['utc'])
+    if tariff is not None:
+        unit = unit + tariff_prices(consumption['local'], tariff)
+    kwh: np.ndarray = consumption['values'] if meters is None else meters
+    return {'local': consumption['local'], 'kwh': kwh, 'cost': kwh * unit / 100}
+
+def group_costs(costs: dict[str, np.ndarray], unit: str) -> (np.ndarray, np.ndarray, np.ndarray):
+    """Sums hourly kWh and costs into local days ('D'), months ('M') or years ('Y')."""
+    keys: np.ndarray = costs['local'].astype(f'datetime64[{unit}]')
+    order: np.ndarray = np.argsort(keys, kind='stable')
+    groups, starts = np.unique(keys[order], return_index=True)
+    kwh: np.ndarray = np.add.reduceat(costs['kwh'][..., order], starts, axis=-1)
+    cost: np.ndarray = np.add.reduceat(costs['cost'][..., order], starts, axis=-1)
+    return groups, kwh, cost
+
+def cost_lines(groups: np.ndarray, kwh: np.ndarray, cost: np.ndarray, label: Callable[[datetime.date], str]) -> list[str]:
+    """Formats grouped costs, summed over meters, into report lines."""
+    if kwh.ndim > 1:
+        kwh = kwh.sum(axis=0)
+        cost = cost.sum(axis=0)
+    result: list[str] = []
+    for group, k, c in zip(groups.tolist(), kwh.tolist(), cost.tolist()):
+        # Average price of the period in c/kWh
+        average: float = c * 100 / k if k else 0
+        result.append(f'{label(group)}: ' + f'{k:.2f} kWh, {c:.2f} €, {average:.2f} c/kWh'.replace('.', ','))
+    return result
+
+def create_daily_cost_report(costs: dict[str, np.ndarray], start: datetime.date, end: datetime.date) -> list[str]:
+    """Builds a daily cost report for a date range (end exclusive, as in create_daily_report)."""
+    groups, kwh, cost = group_costs(costs, 'D')
+    keep: np.ndarray = (groups >= np.datetime64(start)) & (groups < np.datetime64(end))
+    result: list[str] = [f'Costs {start.strftime('%d.%m.%Y')}-{end.strftime('%d.%m.%Y')}']
+    result += cost_lines(groups[keep], kwh[..., keep], cost[..., keep], lambda d: d.strftime('%d.%m.%Y'))
+    return result
+
+def create_monthly_cost_report(costs: dict[str, np.ndarray]) -> list[str]:
+    """Builds a cost report with one line per month."""
+    groups, kwh, cost = group_costs(costs, 'M')
+    return ['Monthly costs'] + cost_lines(groups, kwh, cost, lambda d: d.strftime('%m/%Y'))
+
+def create_yearly_cost_report(costs: dict[str, np.ndarray]) -> list[str]:
+    """Builds a cost report with one line per year."""
+    groups, kwh, cost = group_costs(costs, 'Y')
+    return ['Yearly costs'] + cost_lines(groups, kwh, cost, lambda d: d.strftime('%Y'))
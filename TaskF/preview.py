@@ -0,0 +1,106 @@
+# Copyright (c) 2026 Luukas Kola
+# License: MIT
+"""
+Approximate monthly and yearly summaries from a stratified sample of hours.
+
+The file is read once without parsing timestamps or numbers: lines are split
+into strata by year and month and each stratum keeps the lines with the smallest random
+priorities. Every prefix of a stratum sample is a uniform sample, so estimates
+are refined by parsing more of it. Margins are 95 % confidence intervals.
+"""
+from collections.abc import Iterator
+import heapq
+from math import sqrt
+import os
+import random
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))
+from compressed_io import open_text
+from quantile_sketch import KLLSketch
+from task_f import create_monthly_report, create_yearly_report, read_data
+
+# Normal distribution quantile for a 95 % confidence interval
+Z: float = 1.96
+COLUMNS: list[str] = ['con', 'pro', 'tmp']
+# Year of the monthly report, as in create_monthly_report
+YEAR: int = 2025
+
+def stratified_sample(filename: str, size: int, seed: int | None = None) -> dict[tuple[int, int], tuple[int, list[str]]]:
+    """Returns (year, month) -> (hours in month, sampled lines with every prefix a uniform sample)."""
+    generator: random.Random = random.Random(seed)
+    heaps: dict[tuple[int, int], list[tuple[float, str]]] = {}
+    counts: dict[tuple[int, int], int] = {}
+    with open_text(filename) as f:
+        # Skip header
+        next(f)
+        for line in f:
+            # 2025-01-01T00:00:00.000+02:00 -> year and month from the text, no parsing needed
+            month: tuple[int, int] = (int(line[:4]), int(line[5:7]))
+            counts[month] = counts.get(month, 0) + 1
+            heap: list[tuple[float, str]] = heaps.setdefault(month, [])
+            key: float = generator.random()
+            if len(heap) < size:
+                heapq.heappush(heap, (-key, line))
+            elif key < -heap[0][0]:
+                heapq.heapreplace(heap, (-key, line))
+    return {month: (counts[month], [line for _, line in sorted(heap, reverse=True)]) for month, heap in heaps.items()}
+
+def parse_values(line: str) -> list[float]:
+    """Consumption, production and temperature of one CSV line."""
+    values: list[str] = line.split(';')
+    return [float(values[i].replace(',', '.')) for i in (1, 2, 3)]
+
+def estimate_stratum(rows: list[list[float]], population: int) -> dict[str, tuple[float, float]]:
+    """Estimated column totals of one month and their variances."""
+    n: int = len(rows)
+    result: dict[str, tuple[float, float]] = {}
+    for index, column in enumerate(COLUMNS):
+        values: list[float] = [row[index] for row in rows]
+        mean: float = sum(values) / n
+        variance: float = sum((value - mean) ** 2 for value in values) / (n - 1) if n > 1 else 0.0
+        # Finite population correction, 0 when the whole month is parsed
+        correction: float = (population - n) / population
+        result[column] = (population * mean, population ** 2 * variance / n * correction)
+    return result
+
+def summary_lines(title: str, strata: list[tuple[int, list[list[float]]]]) -> list[str]:
+    """Combines month estimates into report lines like create_monthly_report."""
+    hours: int = sum(population for population, _ in strata)
+    rows: int = sum(len(sample) for _, sample in strata)
+    totals: dict[str, float] = {column: 0.0 for column in COLUMNS}
+    variances: dict[str, float] = {column: 0.0 for column in COLUMNS}
+    for population, sample in strata:
+        for column, (total, variance) in estimate_stratum(sample, population).items():
+            totals[column] += total
+            variances[column] += variance
+    margins: dict[str, float] = {column: Z * sqrt(variance) for column, variance in variances.items()}
+    result: list[str] = [f'{title} (preview from {rows} of {hours} hours, 95 % confidence)']
+    result.append(f'Total consumption: ~{totals['con']:.2f} ± {margins['con']:.2f} kWh'.replace('.', ','))
+    result.append(f'Total production: ~{totals['pro']:.2f} ± {margins['pro']:.2f} kWh'.replace('.', ','))
+    # Average of the hourly temperatures
+    result.append(f'Average temperature: ~{totals['tmp'] / hours:.2f} ± {margins['tmp'] / hours:.2f} C˚'.replace('.', ','))
+    return result
+
+def progressive_summary(filename: str, month: int | None = None, steps: tuple = (24, 96, 240),
+                        exact: bool = True, seed: int | None = None) -> Iterator[list[str]]:
+    """
+    Yields report lines for one month (or the whole year if month is None) from
+    growing samples per month, and last the exact report if exact is set.
+    """
+    sample: dict[tuple[int, int], tuple[int, list[str]]] = stratified_sample(filename, max(steps), seed)
+    if month is not None:
+        if (YEAR, month) not in sample:
+            raise ValueError(f'{filename} has no hours in {month:02d}/{YEAR}')
+        sample = {(YEAR, month): sample[(YEAR, month)]}
+    title: str = f'Month {month} summary' if month is not None else 'Year 2025 summary'
+    parsed: dict[tuple[int, int], list[list[float]]] = {m: [] for m in sample}
+    for step in steps:
+        for m, (_, lines) in sample.items():
+            parsed[m] += [parse_values(line) for line in lines[len(parsed[m]):step]]
+        yield summary_lines(title, [(sample[m][0], parsed[m]) for m in sample])
+    if exact:
+        # The real report, percentiles included
+        sketches: dict[tuple[int, int], KLLSketch] = {}
+        data: dict = read_data(filename, sketches=sketches)
+        yield create_monthly_report(data, sketches, month) if month is not None else create_yearly_report(data, sketches)
@@ -0,0 +1,83 @@
+# Copyright (c) 2026 Luukas Kola
+# License: MIT
+from math import ceil
+import random
+
+class KLLSketch:
+    """
+    Streaming quantile sketch (KLL). Keeps O(k) values no matter how many are added,
+    quantiles are within about 1.7 / k of the true rank. Sketches built on different
+    parts of the data (months, meters, worker processes) can be merged. The fixed
+    default seed keeps reports repeatable, pass seed=None for a random one.
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = 0):
+        self.k: int = k
+        self.n: int = 0
+        # Level h holds values that each stand for 2**h original values
+        self.levels: list[list[float]] = [[]]
+        self.random: random.Random = random.Random(seed)
+
+    def capacity(self, level: int) -> int:
+        """How many values a level may hold, lower levels get less room."""
+        depth: int = len(self.levels) - level - 1
+        return max(ceil(self.k * (2 / 3) ** depth), 2)
+
+    def add(self, value: float) -> None:
+        """Adds one value."""
+        self.levels[0].append(value)
+        self.n += 1
+        if len(self.levels[0]) >= self.capacity(0):
+            self.compress()
+
+    def compress(self) -> None:
+        """Halves every full level by promoting every other sorted value one level up."""
+        level: int = 0
+        while level < len(self.levels):
+            items: list[float] = self.levels[level]
+            if len(items) >= self.capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                items.sort()
+                # An odd value out stays on this level
+                kept: list[float] = [items.pop()] if len(items) % 2 else []
+                self.levels[level + 1].extend(items[self.random.randint(0, 1)::2])
+                self.levels[level] = kept
+            level += 1
+
+    def merge(self, other: 'KLLSketch') -> None:
+        """Adds all values summarised by other into this sketch."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.n += other.n
+        self.compress()
+
+    def quantile(self, q: float) -> float:
+        """Returns the value at rank q (0-1), None for an empty sketch."""
+        weighted: list[tuple[float, int]] = sorted(
+            (value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        if not weighted:
+            return None
+        target: float = q * self.n
+        total: int = 0
+        for value, weight in weighted:
+            total += weight
+            if total >= target:
+                return value
+        return weighted[-1][0]
+
+def merge_sketches(sketches: list[KLLSketch], k: int = 200) -> KLLSketch:
+    """Combines sketches, e.g. from parallel workers, into a new one."""
+    result: KLLSketch = KLLSketch(k)
+    for sketch in sketches:
+        result.merge(sketch)
+    return result
+
+def percentile_lines(sketch: KLLSketch) -> list[str]:
+    """Formats median, p95 and p99 of hourly consumption as report lines."""
+    if sketch is None or sketch.n == 0:
+        return []
+    return [f'Hourly consumption {name}: {sketch.quantile(q):.2f} kWh'.replace('.', ',')
+            for name, q in (('median', 0.5), ('p95', 0.95), ('p99', 0.99))]
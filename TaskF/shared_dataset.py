@@ -0,0 +1,115 @@
+# Copyright (c) 2026 Luukas Kola
+# License: MIT
+"""
+Shares the parsed 2025.csv between report processes on one host.
+
+One loader process parses the file once and publishes the daily and hourly
+arrays in a single shared memory block. Report processes attach to the
+block by name and read the arrays in place, without parsing or copying.
+
+Loader:  python shared_dataset.py [2025.csv] [name]
+Workers: python task_f.py --shared [name]
+"""
+from collections.abc import Iterator, Mapping
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+import json
+import sys
+import numpy as np
+from cost_engine import read_hourly
+from task_f import read_data
+
+DEFAULT_NAME: str = 'task_f_2025'
+# Bytes reserved at the start of the block for the JSON layout
+HEADER_SIZE: int = 4096
+
+def collect_arrays(filename: str) -> dict[str, np.ndarray]:
+    """Parses the CSV once into daily and hourly arrays."""
+    data: dict[datetime.date, dict[str, float]] = read_data(filename)
+    hourly: dict[str, np.ndarray] = read_hourly(filename)
+    return {
+        'days': np.array(list(data), dtype='datetime64[D]'),
+        'con': np.array([v['con'] for v in data.values()]),
+        'pro': np.array([v['pro'] for v in data.values()]),
+        'tmp': np.array([v['tmp'] for v in data.values()]),
+        'hour_local': hourly['local'],
+        'hour_utc': hourly['utc'],
+        'hour_con': hourly['values'],
+    }
+
+def publish(arrays: dict[str, np.ndarray], name: str = DEFAULT_NAME) -> shared_memory.SharedMemory:
+    """Copies the arrays into a new shared memory block. Keep the returned block open while workers run."""
+    layout: dict[str, dict] = {}
+    offset: int = HEADER_SIZE
+    for key, array in arrays.items():
+        layout[key] = {'offset': offset, 'shape': array.shape, 'dtype': array.dtype.str}
+        # Keep every array 8 byte aligned
+        offset += -(-array.nbytes // 8) * 8
+    header: bytes = json.dumps(layout).encode()
+    if len(header) > HEADER_SIZE:
+        raise ValueError('Too many arrays for the shared memory header')
+    block: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name, create=True, size=offset)
+    block.buf[:len(header)] = header
+    for key, array in arrays.items():
+        view: np.ndarray = np.ndarray(array.shape, array.dtype, buffer=block.buf, offset=layout[key]['offset'])
+        view[...] = array
+    return block
+
+def attach_block(name: str) -> shared_memory.SharedMemory:
+    """Attaches to a block without letting this process remove it on exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always tracks, and the tracker would unlink the block when the worker exits
+        block: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(block._name, 'shared_memory')
+        return block
+
+class SharedDailyData(Mapping):
+    """
+    Read-only view of a published dataset that works as the data argument of
+    create_daily_report, create_monthly_report and create_yearly_report.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        # The views below point into the block, so it is kept referenced here
+        self.block: shared_memory.SharedMemory = attach_block(name)
+        raw: bytes = bytes(self.block.buf[:HEADER_SIZE]).rstrip(b'\x00')
+        self.arrays: dict[str, np.ndarray] = {}
+        for key, spec in json.loads(raw).items():
+            self.arrays[key] = np.ndarray(tuple(spec['shape']), np.dtype(spec['dtype']),
+                                          buffer=self.block.buf, offset=spec['offset'])
+        self.first: np.datetime64 = self.arrays['days'][0]
+
+    def __getitem__(self, day: datetime.date) -> dict[str, float]:
+        index: int = int((np.datetime64(day, 'D') - self.first).astype(np.int64))
+        if index < 0 or index >= len(self.arrays['days']) or self.arrays['days'][index] != np.datetime64(day, 'D'):
+            raise KeyError(day)
+        return {'con': float(self.arrays['con'][index]), 'pro': float(self.arrays['pro'][index]),
+                'tmp': float(self.arrays['tmp'][index])}
+
+    def __iter__(self) -> Iterator[datetime.date]:
+        return iter(self.arrays['days'].tolist())
+
+    def __len__(self) -> int:
+        return len(self.arrays['days'])
+
+    def close(self) -> None:
+        """Detaches from the block, the arrays can not be used after this."""
+        self.arrays = {}
+        self.block.close()
+
+def main() -> None:
+    """Publishes the dataset and keeps it available until Enter is pressed."""
+    filename: str = sys.argv[1] if len(sys.argv) > 1 else '2025.csv'
+    name: str = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_NAME
+    block: shared_memory.SharedMemory = publish(collect_arrays(filename), name)
+    print(f'Published {filename} as {name} ({block.size} bytes), press Enter to stop')
+    try:
+        input()
+    finally:
+        block.close()
+        block.unlink()
+
+if __name__ == "__main__":
+    main()
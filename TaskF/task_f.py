@@ -1,31 +1,54 @@
 # Copyright (c) 2026 Luukas Kola
 # License: MIT
 from datetime import datetime, timedelta
-
-def read_data(filename: str) -> dict[datetime.date, dict[str, float]]:
-    """Reads a CSV file and returns the rows in a suitable structure."""
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))
+from compressed_io import open_text
+from quarantine import ROW_ERRORS, Quarantine
+from quantile_sketch import KLLSketch, merge_sketches, percentile_lines
+
+def read_data(filename: str, quarantine: Quarantine = None,
+              sketches: dict[tuple[int, int], KLLSketch] = None) -> dict[datetime.date, dict[str, float]]:
+    """
+    Reads a CSV file and returns the rows in a suitable structure. With a quarantine, bad lines are set aside.
+    With sketches, hourly consumption is also fed into one quantile sketch per (year, month).
+    """
     ...
     data: dict[datetime.date, dict[str, float]] = {}
-    with open(filename) as f:
-        text: str = f.read()
-        for line in text.splitlines()[1:]:
-            # Values from csv
-            values: list[str] = line.split(';')
-            # Date
-            date: datetime.date = datetime.strptime(values[0].strip(), '%Y-%m-%dT%H:%M:%S.%f%z').date()
+    with open_text(filename) as f:
+        # Skip header
+        next(f)
+        for line_number, line in enumerate(f, 2):
+            try:
+                # Values from csv
+                values: list[str] = line.split(';')
+                # Date
+                date: datetime.date = datetime.strptime(values[0].strip(), '%Y-%m-%dT%H:%M:%S.%f%z').date()
+                con: float = float(values[1].replace(',','.'))
+                pro: float = float(values[2].replace(',','.'))
+                tmp: float = float(values[3].replace(',','.'))
+            except ROW_ERRORS as e:
+                if quarantine is None:
+                    raise
+                quarantine.add(line_number, line, e)
+                continue
+            if sketches is not None:
+                sketches.setdefault((date.year, date.month), KLLSketch()).add(con)
             # Create entry if no date meaning on header
             if date not in data:
                 row: dict[str|float] = {}
                 # Add row values
-                row['con'] = float(values[1].replace(',','.'))
-                row['pro'] = float(values[2].replace(',','.'))
-                row['tmp'] = float(values[3].replace(',','.'))
+                row['con'] = con
+                row['pro'] = pro
+                row['tmp'] = tmp
                 # Add row to data
                 data[date] = row
             else:
-                data[date]['con'] += float(values[1].replace(',','.'))
-                data[date]['pro'] += float(values[2].replace(',','.'))
-                data[date]['tmp'] += float(values[3].replace(',','.'))
+                data[date]['con'] += con
+                data[date]['pro'] += pro
+                data[date]['tmp'] += tmp
     # Average out temperatures
     for _,v in data.items():
         v['tmp'] /= 24
@@ -36,7 +59,7 @@ def write_report_to_file(lines: list[str]) -> None:
     with open("report.txt", "w", encoding="utf-8") as f:
         f.write('\n'.join(lines) + '\n')
 
-def show_main_menu(data: dict[datetime.date, dict[str, float]]) -> str:
+def show_main_menu(data: dict[datetime.date, dict[str, float]], sketches: dict[tuple[int, int], KLLSketch] = None) -> str:
     """Prints the main menu and returns the user selection as a string."""
     menu : str = '''Choose a report type:
     1) Daily summary for a date range
@@ -59,23 +82,23 @@ def show_main_menu(data: dict[datetime.date, dict[str, float]]) -> str:
             if lines is None:
                 return
             print_report_to_console(lines)
-            show_extra_menu(lines, data)
+            show_extra_menu(lines, data, sketches)
         case '2':
-            lines: list[str] = create_monthly_report(data)
+            lines: list[str] = create_monthly_report(data, sketches)
             if lines is None:
                 return
             print_report_to_console(lines)
-            show_extra_menu(lines, data)
+            show_extra_menu(lines, data, sketches)
         case '3':
-            lines: list[str] = create_yearly_report(data)
+            lines: list[str] = create_yearly_report(data, sketches)
             if lines is None:
                 return
             print_report_to_console(lines)
-            show_extra_menu(lines, data)
+            show_extra_menu(lines, data, sketches)
         case '4':
             exit()
 
-def show_extra_menu(lines: list[str], data: dict[datetime.date, dict[str, float]]) -> None:
+def show_extra_menu(lines: list[str], data: dict[datetime.date, dict[str, float]], sketches: dict[tuple[int, int], KLLSketch] = None) -> None:
     """Prints extra menu after report type is chosen"""
     menu: str = '''What would you like to do next?
     1) Write the report to the file report.txt
@@ -93,18 +116,20 @@ def show_extra_menu(lines: list[str], data: dict[datetime.date, dict[str, float]
         case 1:
             write_report_to_file(lines)
         case 2:
-            show_main_menu(data)
+            show_main_menu(data, sketches)
         case 3:
             exit()
         case _:
             print("Select between 1-3!")
 
 
-def create_daily_report(data: dict[datetime.date, dict[str, float]]) -> list[str]:
-    """Builds a daily report for a selected date range."""
+def create_daily_report(data: dict[datetime.date, dict[str, float]],
+                        start: datetime.date = None, end: datetime.date = None) -> list[str]:
+    """Builds a daily report for a date range, asking the user for it if not given."""
     try:
-        start: datetime.date = datetime.strptime(input('Enter start date (dd.mm.yyyy)\n: '), "%d.%m.%Y").date()
-        end: datetime.date = datetime.strptime(input('Enter end date (dd.mm.yyyy)\n: '), "%d.%m.%Y").date()
+        if start is None or end is None:
+            start = datetime.strptime(input('Enter start date (dd.mm.yyyy)\n: '), "%d.%m.%Y").date()
+            end = datetime.strptime(input('Enter end date (dd.mm.yyyy)\n: '), "%d.%m.%Y").date()
         if end < start:
             raise Exception('Start later than end')
     except ValueError as e:
@@ -134,10 +159,12 @@ def create_daily_report(data: dict[datetime.date, dict[str, float]]) -> list[str
     result.append(f'Average temperature: {average_t:.2f} C˚'.replace('.',','))
     return result
 
-def create_monthly_report(data: dict[datetime.date, dict[str, float]]) -> list[str]:
-    """Builds a monthly summary report for a selected month."""
+def create_monthly_report(data: dict[datetime.date, dict[str, float]], sketches: dict[tuple[int, int], KLLSketch] = None,
+                          month: int = None) -> list[str]:
+    """Builds a monthly summary report for a month, asked from the user if not given, with percentiles if sketches are given."""
     try:
-        month: int = int(input('Enter month number (1-12)\n: '))
+        if month is None:
+            month = int(input('Enter month number (1-12)\n: '))
         if month < 1 or month > 12: 
             raise ValueError("Select from range 1-12")
     except ValueError as e:
@@ -168,10 +195,13 @@ def create_monthly_report(data: dict[datetime.date, dict[str, float]]) -> list[s
     result.append(f'Total consumption: {consumption:.2f} kWh'.replace('.',','))
     result.append(f'Total production: {production:.2f} kWh'.replace('.',','))
     result.append(f'Average temperature: {average_t:.2f} C˚'.replace('.',','))
+    if sketches:
+        # Same year as the days summed above
+        result += percentile_lines(sketches.get((2025, month)))
     return result
 
-def create_yearly_report(data: dict[datetime.date, dict[str, float]]) -> list[str]:
-    """Builds a full-year summary report."""
+def create_yearly_report(data: dict[datetime.date, dict[str, float]], sketches: dict[tuple[int, int], KLLSketch] = None) -> list[str]:
+    """Builds a full-year summary report, with percentiles if sketches are given."""
 
     consumption: float = 0
     production: float = 0
@@ -190,6 +220,8 @@ def create_yearly_report(data: dict[datetime.date, dict[str, float]]) -> list[st
     result.append(f'Total consumption: {consumption:.2f} kWh'.replace('.',','))
     result.append(f'Total production: {production:.2f} kWh'.replace('.',','))
     result.append(f'Average temperature: {average_t:.2f} C˚'.replace('.',','))
+    if sketches:
+        result += percentile_lines(merge_sketches(list(sketches.values())))
     return result
 
 def print_report_to_console(lines: list[str]) -> None:
@@ -199,11 +231,18 @@ def print_report_to_console(lines: list[str]) -> None:
 
 def main() -> None:
     """Main function: reads data, shows menus, and controls report generation."""
-    # Read data first
-    data: dict[datetime.date, dict[str, float]] = read_data('2025.csv')
+    sketches: dict[tuple[int, int], KLLSketch] = {}
+    if '--shared' in sys.argv:
+        # Use the data published by shared_dataset.py instead of reading the file again
+        from shared_dataset import DEFAULT_NAME, SharedDailyData
+        names: list[str] = sys.argv[sys.argv.index('--shared') + 1:]
+        data: dict[datetime.date, dict[str, float]] = SharedDailyData(names[0] if names else DEFAULT_NAME)
+    else:
+        # Read data first, with hourly consumption percentiles per month
+        data: dict[datetime.date, dict[str, float]] = read_data('2025.csv', sketches=sketches)
     # Then allow the user to to read the data
     while True:
-        show_main_menu(data)
+        show_main_menu(data, sketches)
 
 if __name__ == "__main__":
     main()
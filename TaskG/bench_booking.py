@@ -0,0 +1,99 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Load test of BookingWriter: concurrent producer threads book random slots
+in a copy of reservations.txt, once with group commit and once with an
+fsync per booking, and the bookings/s and latencies are printed
+
+Run: python bench_booking.py [producers] [bookings per producer]
+"""
+
+from datetime import date, time as clock, timedelta
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from booking_writer import BookingWriter
+from occupancy import Occupancy
+from task_g_dict import fetch_reservations
+
+RESOURCES: list[str] = [f"Meeting Room {i}" for i in range(1, 41)]
+
+
+def producer(writer: BookingWriter, count: int, seed: int, latencies: list[float], results: list[bool]) -> None:
+    """Books count random slots, recording the latency and outcome of every booking"""
+    generator: random.Random = random.Random(seed)
+    for _ in range(count):
+        booking: dict = {
+            "name": "Load Test", "email": "load@test.fi", "phone": "0400000000",
+            "date": date(2026, 1, 1) + timedelta(days=generator.randrange(60)),
+            "time": clock(generator.randrange(8, 20)), "duration": generator.randint(1, 3),
+            "price": 10.0, "confirmed": True, "resource": generator.choice(RESOURCES),
+        }
+        start: float = time.perf_counter()
+        try:
+            writer.book(booking)
+            results.append(True)
+        except ValueError:
+            results.append(False)
+        latencies.append(time.perf_counter() - start)
+
+
+def run(filename: str, producers: int, count: int, max_batch: int) -> None:
+    """Runs one load test against filename and prints its figures"""
+    latencies: list[float] = []
+    results: list[bool] = []
+    with BookingWriter(filename, max_batch=max_batch) as writer:
+        threads: list[threading.Thread] = [
+            threading.Thread(target=producer, args=(writer, count, seed, latencies, results)) for seed in range(producers)]
+        start: float = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed: float = time.perf_counter() - start
+        commits: int = writer.commits
+    latencies.sort()
+    accepted: int = sum(results)
+    print(f"max batch {max_batch}: {accepted} booked, {len(results) - accepted} rejected as conflicts, {commits} fsyncs")
+    print(f"  {len(results) / elapsed:.0f} bookings/s, latency median {statistics.median(latencies) * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+
+
+def check(filename: str, before: int) -> None:
+    """Checks the written file: every line converts, ids are unique and the new bookings do not overlap"""
+    reservations: list[dict] = fetch_reservations(filename)
+    assert len({r["id"] for r in reservations}) == len(reservations), "repeated ids"
+    slots: Occupancy = Occupancy([], origin=date(2026, 1, 1))
+    for reservation in reservations[before:]:
+        start = slots.origin.combine(reservation["date"], reservation["time"])
+        assert not slots.bitmaps.get(reservation["resource"], 0) & slots.slot_mask(start, reservation["duration"]), "overlap"
+        slots.reserve(reservation["resource"], start, reservation["duration"])
+    print(f"  file ok: {len(reservations) - before} new lines, no overlaps")
+
+
+def main():
+    """Runs the load test with group commit and with an fsync per booking"""
+    producers: int = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    count: int = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    before: int = len(fetch_reservations("reservations.txt"))
+    for max_batch in (1000, 1):
+        with tempfile.TemporaryDirectory() as folder:
+            filename: str = os.path.join(folder, "reservations.txt")
+            shutil.copy("reservations.txt", filename)
+            run(filename, producers, count, max_batch)
+            check(filename, before)
+
+
+if __name__ == "__main__":
+    main()
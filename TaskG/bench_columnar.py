@@ -0,0 +1,60 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Benchmark: parsing reservations.txt with fetch_reservations against loading
+the same reservations from a columnar file
+
+Run: python bench_columnar.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from columnar import export_columns, load_columns
+from task_g_dict import fetch_reservations
+
+
+def main():
+    """
+    Writes a text file of the given size from reservations.txt, exports it
+    and prints how long reloading takes each way
+    """
+    rows: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with open("reservations.txt", "r", encoding="utf-8") as f:
+        lines: list[str] = [line.rstrip("\n") for line in f if len(line) > 1]
+    with tempfile.TemporaryDirectory() as folder:
+        text_file: str = os.path.join(folder, "reservations.txt")
+        column_file: str = os.path.join(folder, "reservations.col")
+        with open(text_file, "w", encoding="utf-8") as f:
+            for i in range(rows):
+                fields: list[str] = lines[i % len(lines)].split("|")
+                fields[0] = str(i)
+                f.write("|".join(fields) + "\n")
+
+        start: float = time.perf_counter()
+        reservations: list[dict] = fetch_reservations(text_file)
+        parse: float = time.perf_counter() - start
+        export_columns(reservations, column_file)
+
+        start = time.perf_counter()
+        load_columns(column_file, decode_text=False)
+        mapped: float = time.perf_counter() - start
+        start = time.perf_counter()
+        load_columns(column_file)
+        decoded: float = time.perf_counter() - start
+
+        print(f"{rows} reservations, text {os.path.getsize(text_file) / 1e6:.1f} MB, columnar {os.path.getsize(column_file) / 1e6:.1f} MB")
+        print(f"parse text: {parse:.3f} s")
+        print(f"load columnar (codes): {mapped:.4f} s, {parse / mapped:.0f}x faster")
+        print(f"load columnar (decoded text): {decoded:.4f} s, {parse / decoded:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Benchmark: HyperLogLog distinct counts against exact sets
+
+Writes a reservation file with many bookers and email domains, counts it
+with distinct_sketch in parallel shards and exactly with sets, and prints
+the memory used and the errors of the estimates
+
+Run: python bench_distinct.py [rows] [shards]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from distinct_sketch import distinct_counts, email_domain, merge_counts
+
+
+def write_file(filename: str, rows: int) -> None:
+    """Writes rows random reservations: 50 resources, a year of dates, bookers from 2000 domains"""
+    generator: random.Random = random.Random(0)
+    bookers: int = max(rows // 4, 1)
+    with open(filename, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            booker: int = generator.randrange(bookers)
+            f.write(f"{i}|Booker {booker}|booker{booker}@domain{booker % 2000}.fi|0400000000|"
+                    f"2025-{generator.randint(1, 12):02d}-{generator.randint(1, 28):02d}|10:00|1|10.00|True|"
+                    f"Room {generator.randrange(50)}|2025-01-01 00:00:00\n")
+
+
+def set_size(values: set[str]) -> int:
+    """Bytes used by a set of strings, the strings included"""
+    return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+
+
+def main():
+    """Compares sketch estimates with exact counts"""
+    rows: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    shards: int = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with tempfile.TemporaryDirectory() as folder:
+        filename: str = os.path.join(folder, "reservations.txt")
+        write_file(filename, rows)
+
+        start: float = time.perf_counter()
+        with ProcessPoolExecutor(shards) as pool:
+            counts: dict = merge_counts(list(pool.map(distinct_counts, [filename] * shards, range(shards), [shards] * shards)))
+        sketched: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact_bookers: dict[tuple[str, str], set[str]] = {}
+        exact_domains: set[str] = set()
+        # Same columns and parsing as distinct_counts, in one process
+        with open(filename, encoding="utf-8") as f:
+            for line in f:
+                fields: list[str] = line.split("|")
+                day: date = date.fromisoformat(fields[4])
+                email: str = fields[2].strip().lower()
+                exact_bookers.setdefault((fields[9], f"{day.month:02d}/{day.year}"), set()).add(email)
+                exact_domains.add(email_domain(email))
+        exact: float = time.perf_counter() - start
+
+    errors: list[float] = [abs(counts["bookers"][group].estimate() - len(emails)) / len(emails) * 100
+                           for group, emails in exact_bookers.items()]
+    domain_error: float = abs(counts["domains"].estimate() - len(exact_domains)) / len(exact_domains) * 100
+    sketch_bytes: int = sum(sketch.size() for sketch in counts["bookers"].values()) + counts["domains"].size()
+    exact_bytes: int = sum(set_size(emails) for emails in exact_bookers.values()) + set_size(exact_domains)
+    print(f"{rows} reservations, {len(exact_bookers)} resource months, {len(exact_domains)} email domains")
+    print(f"sketches ({shards} shards, {os.cpu_count()} CPUs): {sketched:.2f} s, {sketch_bytes / 1e6:.2f} MB")
+    print(f"exact sets: {exact:.2f} s, {exact_bytes / 1e6:.2f} MB")
+    print(f"bookers per resource and month: mean error {statistics.mean(errors):.2f} %, max {max(errors):.2f} %")
+    print(f"email domains: ~{counts['domains'].estimate():.0f} of {len(exact_domains)}, error {domain_error:.2f} %")
+
+
+if __name__ == "__main__":
+    main()
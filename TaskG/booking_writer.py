@@ -0,0 +1,233 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Appends bookings from many concurrent producers to a reservation file
+
+One BookingWriter owns the file: it holds an exclusive lock on it, so a
+second writer process fails instead of interleaving lines. Producer threads
+call book(); a booking that overlaps an existing one of the same resource
+(hour slots as in occupancy.py) is rejected at once from the in-memory slot
+index. Accepted bookings are queued and a committer thread appends them in
+batches with one write and one fsync per batch (group commit). book()
+returns when the booking is on disk.
+
+Example:
+ with BookingWriter("reservations.txt") as writer:
+     reservation_id = writer.book({"name": ..., "resource": "Red Room", ...})
+"""
+
+from concurrent.futures import Future
+from datetime import date, datetime
+import os
+import queue
+import threading
+import time
+from occupancy import Occupancy
+from task_g_dict import fetch_reservations
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# Fields a booking must have, id and createdAt are given by the writer
+BOOKING_FIELDS: list[str] = ["name", "email", "phone", "date", "time", "duration", "price", "confirmed", "resource"]
+# Most bookings in one commit and how long the committer waits to fill a batch, in seconds
+MAX_BATCH: int = 1000
+MAX_DELAY: float = 0.002
+
+
+def format_reservation(reservation: dict) -> str:
+    """
+    Formats a reservation as a line of reservations.txt, the reverse of convert_reservation_data
+
+    Parameters:
+     reservation (dict): Reservation with all fields of the dict version
+    """
+    for field in ["name", "email", "phone", "resource"]:
+        if "|" in reservation[field] or "\n" in reservation[field]:
+            raise ValueError(f"{field} may not contain | or line breaks")
+    return (f'{reservation["id"]}|{reservation["name"]}|{reservation["email"]}|{reservation["phone"]}|'
+            f'{reservation["date"].strftime("%Y-%m-%d")}|{reservation["time"].strftime("%H:%M")}|'
+            f'{reservation["duration"]}|{reservation["price"]:.2f}|{reservation["confirmed"]}|'
+            f'{reservation["resource"]}|{reservation["created"].strftime("%Y-%m-%d %H:%M:%S")}\n')
+
+
+def lock_file(f) -> None:
+    """Takes an exclusive lock on an open file, raises OSError if another process holds it"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError as e:
+        raise OSError(f"{f.name} is locked by another writer") from e
+
+
+class BookingWriter:
+    """Thread safe, group committing writer of one reservation file"""
+
+    def __init__(self, filename: str, max_batch: int = MAX_BATCH, max_delay: float = MAX_DELAY):
+        """
+        Parameters:
+         filename (str): Reservation file, created if missing
+         max_batch (int): Most bookings written with one fsync
+         max_delay (float): Seconds the committer waits for more bookings before writing
+        """
+        self.filename: str = filename
+        self.max_batch: int = max_batch
+        self.max_delay: float = max_delay
+        self.file = None
+        self.lock: threading.Lock = threading.Lock()
+        self.pending: queue.Queue = queue.Queue()
+        self.committer: threading.Thread = None
+        self.error: Exception = None
+        # Batches written, for the load test
+        self.commits: int = 0
+
+    def open(self) -> None:
+        """Locks the file, builds the slot index from its reservations and starts the committer"""
+        self.file = open(self.filename, "a", encoding="utf-8")
+        try:
+            lock_file(self.file)
+            reservations: list[dict] = fetch_reservations(self.filename)
+        except BaseException:
+            self.file.close()
+            raise
+        first: date = min((r["date"] for r in reservations), default=date.today())
+        self.slots: Occupancy = Occupancy(reservations, origin=min(first, date.today()))
+        self.next_id: int = max((r["id"] for r in reservations), default=0) + 1
+        # A file without a final line break would glue the first booking to its last line
+        if os.path.getsize(self.filename) > 0:
+            with open(self.filename, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self.file.write("\n")
+        self.committer = threading.Thread(target=self.commit_loop, name="booking-committer", daemon=True)
+        self.committer.start()
+
+    def reserve(self, booking: dict) -> tuple[int, str]:
+        """
+        Checks a booking against the slot index and marks its hours taken, call with self.lock held
+
+        Returns:
+         reservation_id (int): Id given to the booking
+         line (str): The reservation line to append
+        """
+        missing: list[str] = [field for field in BOOKING_FIELDS if field not in booking]
+        if missing:
+            raise ValueError(f"Booking is missing {', '.join(missing)}")
+        if booking["duration"] < 1:
+            raise ValueError("Duration must be at least one hour")
+        if self.error is not None:
+            raise RuntimeError("Writer stopped after an error") from self.error
+        if self.committer is None or not self.committer.is_alive():
+            raise RuntimeError("Writer is not open")
+        start: datetime = datetime.combine(booking["date"], booking["time"])
+        resource: str = booking["resource"]
+        mask: int = self.slots.slot_mask(start, booking["duration"])
+        if self.slots.bitmaps.get(resource, 0) & mask:
+            raise ValueError(f"{resource} is already reserved at {start}")
+        reservation: dict = dict(booking, id=self.next_id, created=datetime.now().replace(microsecond=0))
+        line: str = format_reservation(reservation)
+        # Fail here rather than in the committer, e.g. for a lone surrogate in a name
+        try:
+            line.encode("utf-8")
+        except UnicodeEncodeError as e:
+            raise ValueError("Booking has text that cannot be written as UTF-8") from e
+        self.slots.reserve(resource, start, booking["duration"])
+        self.next_id += 1
+        return reservation["id"], line
+
+    def submit(self, booking: dict) -> Future:
+        """
+        Queues a booking without waiting for the disk
+
+        Parameters:
+         booking (dict): Fields of BOOKING_FIELDS, converted as in convert_reservation_data
+
+        Returns:
+         future (Future): Resolves to the reservation id once written, raises ValueError for a
+         conflict or a bad booking and RuntimeError when the writer is closed or has failed
+        """
+        future: Future = Future()
+        try:
+            # Queued under the lock too, so nothing is queued behind close() or a failed committer
+            with self.lock:
+                reservation_id, line = self.reserve(booking)
+                self.pending.put((reservation_id, line, future))
+        except (ValueError, RuntimeError) as e:
+            future.set_exception(e)
+        return future
+
+    def book(self, booking: dict) -> int:
+        """Books and waits until the booking is on disk, returns the reservation id"""
+        return self.submit(booking).result()
+
+    def commit_loop(self) -> None:
+        """Committer thread: writes queued bookings in batches, one fsync per batch"""
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            batch: list = [item]
+            stop: bool = False
+            # Take what arrived while the previous batch was written, and what comes within max_delay
+            deadline: float = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.pending.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            if self.error is not None:
+                # Bookings queued before the failure are not written after it
+                for _, _, future in batch:
+                    future.set_exception(RuntimeError("Writer stopped after an error"))
+            else:
+                try:
+                    self.file.write("".join(line for _, line, _ in batch))
+                    self.file.flush()
+                    os.fsync(self.file.fileno())
+                except Exception as e:
+                    # The slot index no longer matches the file, refuse further bookings
+                    with self.lock:
+                        self.error = e
+                    for _, _, future in batch:
+                        future.set_exception(e)
+                else:
+                    self.commits += 1
+                    for reservation_id, _, future in batch:
+                        future.set_result(reservation_id)
+            if stop:
+                return
+
+    def close(self) -> None:
+        """Writes the queued bookings, stops the committer and releases the file"""
+        with self.lock:
+            committer: threading.Thread = self.committer
+            self.committer = None
+        if committer is not None:
+            self.pending.put(None)
+            committer.join()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
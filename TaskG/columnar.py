@@ -0,0 +1,140 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Columnar binary file of converted reservations (task_g_dict)
+
+File layout:
+
+ RESCOL1\\n | header length (8 bytes, little endian) | JSON header | columns
+
+The JSON header lists the row count and every column with its NumPy dtype
+and byte offset. Text columns are dictionary encoded: an int32 code per row and a
+dictionary of the distinct values stored as one UTF-8 blob separated by
+newlines. Columns are 8 byte aligned, so load_columns can memory-map the
+file and return views without copying or parsing.
+
+The table returned by load_columns has the same columns as query.to_columns.
+"""
+
+from datetime import time
+import json
+import numpy as np
+
+MAGIC: bytes = b"RESCOL1\n"
+TEXT_COLUMNS: list[str] = ["name", "email", "phone", "resource"]
+
+
+def encode_text(values: list[str]) -> tuple[np.ndarray, bytes]:
+    """
+    Dictionary encodes text values
+
+    Returns:
+     codes (ndarray): int32 index of each value in the dictionary
+     dictionary (bytes): Distinct values joined with newlines
+    """
+    index: dict[str, int] = {}
+    codes: np.ndarray = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int32,
+                                    count=len(values))
+    return codes, "\n".join(index).encode("utf-8")
+
+
+def export_columns(reservations: list[dict], filename: str) -> None:
+    """
+    Writes converted reservations to a columnar binary file
+
+    Parameters:
+     reservations (list): Reservations from fetch_reservations (dict version)
+     filename (str): Output file
+    """
+    arrays: dict[str, np.ndarray] = {
+        "id": np.array([r["id"] for r in reservations], dtype=np.int64),
+        "date": np.array([r["date"] for r in reservations], dtype="datetime64[D]"),
+        # Minutes after midnight, as in query.to_columns
+        "time": np.array([r["time"].hour * 60 + r["time"].minute for r in reservations], dtype=np.int64),
+        "duration": np.array([r["duration"] for r in reservations], dtype=np.int64),
+        "price": np.array([r["price"] for r in reservations], dtype=np.float64),
+        "confirmed": np.array([r["confirmed"] for r in reservations], dtype=bool),
+        "created": np.array([r["created"] for r in reservations], dtype="datetime64[s]"),
+    }
+    blobs: dict[str, bytes] = {}
+    for column in TEXT_COLUMNS:
+        arrays[column], blobs[column] = encode_text([r[column] for r in reservations])
+
+    # Lay out the columns first so the header can list the offsets
+    header: dict = {"rows": len(reservations), "columns": {}, "dictionaries": {}}
+    parts: list[bytes] = []
+    position: int = 0
+    for name, array in arrays.items():
+        header["columns"][name] = {"offset": position, "dtype": array.dtype.str}
+        data: bytes = array.tobytes()
+        # Pad to keep the next column aligned
+        parts.append(data + b"\0" * (-len(data) % 8))
+        position += len(parts[-1])
+    for name, blob in blobs.items():
+        header["dictionaries"][name] = {"offset": position, "size": len(blob)}
+        parts.append(blob + b"\0" * (-len(blob) % 8))
+        position += len(parts[-1])
+    encoded: bytes = json.dumps(header).encode("utf-8")
+    start: int = len(MAGIC) + 8 + len(encoded)
+    encoded += b" " * (-start % 8)
+
+    with open(filename, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(8, "little"))
+        f.write(encoded)
+        for part in parts:
+            f.write(part)
+
+
+def load_columns(filename: str, decode_text: bool = True) -> dict[str, np.ndarray]:
+    """
+    Memory-maps a columnar reservation file
+
+    Parameters:
+     filename (str): File written by export_columns
+     decode_text (bool): Turn text codes into string arrays; when False the
+      codes are returned as is and the dictionaries under "<column>_values"
+
+    Returns:
+     table (dict): One NumPy array per column
+    """
+    raw: np.ndarray = np.memmap(filename, dtype=np.uint8, mode="r")
+    if bytes(raw[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{filename} is not a columnar reservation file")
+    length: int = int.from_bytes(bytes(raw[len(MAGIC):len(MAGIC) + 8]), "little")
+    start: int = len(MAGIC) + 8
+    header: dict = json.loads(bytes(raw[start:start + length]))
+    data: np.ndarray = raw[start + length:]
+    rows: int = header["rows"]
+
+    table: dict[str, np.ndarray] = {}
+    for name, spec in header["columns"].items():
+        dtype: np.dtype = np.dtype(spec["dtype"])
+        table[name] = data[spec["offset"]:spec["offset"] + rows * dtype.itemsize].view(dtype)
+    for name, spec in header["dictionaries"].items():
+        blob: bytes = bytes(data[spec["offset"]:spec["offset"] + spec["size"]])
+        values: np.ndarray = np.array(blob.decode("utf-8").split("\n") if rows else [], dtype=str)
+        if decode_text:
+            table[name] = values[table[name]]
+        else:
+            table[f"{name}_values"] = values
+    return table
+
+
+def to_reservations(table: dict[str, np.ndarray]) -> list[dict]:
+    """
+    Turns a decoded table back into reservation dictionaries for the report functions
+
+    Parameters:
+     table (dict): Table from load_columns with decode_text=True
+    """
+    columns: dict[str, list] = {name: array.tolist() for name, array in table.items()}
+    columns["time"] = [time(minutes // 60, minutes % 60) for minutes in columns["time"]]
+    names: list[str] = ["id", "name", "email", "phone", "date", "time", "duration", "price", "confirmed", "resource", "created"]
+    return [dict(zip(names, row)) for row in zip(*[columns[name] for name in names])]
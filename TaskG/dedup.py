@@ -0,0 +1,189 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Removes repeated reservationIds from re-exported reservation files
+
+Overlapping exports repeat rows, and the reports would count them twice.
+Of the rows with the same reservationId the one with the latest createdAt
+is kept (the later line on a tie), in the order of the file.
+
+The file is read in passes instead of keeping rows in memory:
+
+ 1. (Bloom mode only) every id goes through a Bloom filter, ids it may
+    have seen before are suspects. Other ids are known to be unique.
+ 2. id, createdAt and line number of the indexed rows (all rows, or the
+    suspects) go to int64 arrays, 24 bytes per row, and NumPy picks the
+    line number of the latest row per id.
+ 3. Rows are yielded, skipping indexed rows whose line is not a winner.
+
+Rows whose id or createdAt does not parse are always kept, so conversion
+reports them (or a quarantine takes them) as usual.
+
+Example:
+ total_revenue(list(unique_reservations("reservations.txt")))
+"""
+
+from array import array
+from collections.abc import Iterator
+import os
+import sys
+import numpy as np
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from compressed_io import open_text
+from quarantine import ROW_ERRORS, Quarantine
+from task_g_dict import convert_reservation_data
+
+# Bloom filter bits per expected row and number of hashes, about 1 % false positives
+BLOOM_BITS_PER_ROW: int = 10
+BLOOM_HASHES: int = 7
+# Removes the separators of "2025-08-12 14:33:20" -> 20250812143320, which sorts like the time
+TIMESTAMP_DIGITS: dict = str.maketrans("", "", "-: ")
+
+
+class BloomFilter:
+    """Set of ints with no false negatives and a tunable false positive rate"""
+
+    def __init__(self, expected: int, bits_per_item: int = BLOOM_BITS_PER_ROW, hashes: int = BLOOM_HASHES):
+        self.size: int = max(expected * bits_per_item, 64)
+        self.hashes: int = hashes
+        self.bits: bytearray = bytearray((self.size + 7) // 8)
+
+    def positions(self, item: int) -> Iterator[int]:
+        """Bit positions of an item by double hashing two multiplicative hashes"""
+        first: int = (item * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        second: int = ((item * 0xC2B2AE3D27D4EB4F) & 0xFFFFFFFFFFFFFFFF) | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item: int) -> bool:
+        """
+        Adds an item
+
+        Returns:
+         seen (bool): True if the item may have been added before
+        """
+        seen: bool = True
+        for position in self.positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] >> bit & 1:
+                seen = False
+                self.bits[byte] |= 1 << bit
+        return seen
+
+
+def row_key(line: str) -> tuple[int, int]:
+    """Id and createdAt (as a sortable int) of a raw line, raises ROW_ERRORS if they do not parse"""
+    fields: list[str] = line.split("|")
+    return int(fields[0]), int(fields[10].strip().translate(TIMESTAMP_DIGITS))
+
+
+def numbered_lines(reservation_file: str) -> Iterator[tuple[int, str]]:
+    """Line numbers (first line is 1) and non-empty lines of a file"""
+    with open_text(reservation_file, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if len(line) > 1:
+                yield line_number, line
+
+
+def suspect_ids(reservation_file: str, expected_rows: int) -> set[int]:
+    """
+    Ids that may repeat according to a Bloom filter
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     expected_rows (int): About how many rows the file has, sizes the filter
+    """
+    bloom: BloomFilter = BloomFilter(expected_rows)
+    suspects: set[int] = set()
+    for _, line in numbered_lines(reservation_file):
+        try:
+            reservation_id: int = int(line.split("|", 1)[0])
+        except ROW_ERRORS:
+            continue
+        if bloom.add(reservation_id):
+            suspects.add(reservation_id)
+    return suspects
+
+
+def winning_lines(reservation_file: str, suspects: set[int] = None) -> np.ndarray:
+    """
+    Line numbers of the latest row of every indexed id, ascending
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     suspects (set): Index only these ids, None indexes every row
+    """
+    ids: array = array("q")
+    created: array = array("q")
+    lines: array = array("q")
+    for line_number, line in numbered_lines(reservation_file):
+        try:
+            reservation_id, timestamp = row_key(line)
+        except ROW_ERRORS:
+            continue
+        if suspects is None or reservation_id in suspects:
+            ids.append(reservation_id)
+            created.append(timestamp)
+            lines.append(line_number)
+    id_column: np.ndarray = np.frombuffer(ids, dtype=np.int64)
+    line_column: np.ndarray = np.frombuffer(lines, dtype=np.int64)
+    # Sorted by id, then createdAt, then line, the last row of each id wins
+    order: np.ndarray = np.lexsort((line_column, np.frombuffer(created, dtype=np.int64), id_column))
+    sorted_ids: np.ndarray = id_column[order]
+    last: np.ndarray = np.append(sorted_ids[1:] != sorted_ids[:-1], True) if len(order) else np.zeros(0, dtype=bool)
+    return np.sort(line_column[order][last])
+
+
+def unique_lines(reservation_file: str, expected_rows: int = None) -> Iterator[tuple[int, str]]:
+    """
+    Yields line numbers and lines of a reservation file without repeated ids
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     expected_rows (int): Use a Bloom filter sized for this many rows to index
+      only the ids that may repeat, for files too large to index every row
+    """
+    suspects: set[int] = suspect_ids(reservation_file, expected_rows) if expected_rows else None
+    winners: list[int] = winning_lines(reservation_file, suspects).tolist()
+    # Both winners and the lines ascend, so one index walks through the winners
+    next_winner: int = 0
+    for line_number, line in numbered_lines(reservation_file):
+        try:
+            reservation_id, _ = row_key(line)
+        except ROW_ERRORS:
+            yield line_number, line
+            continue
+        if suspects is not None and reservation_id not in suspects:
+            yield line_number, line
+        elif next_winner < len(winners) and winners[next_winner] == line_number:
+            next_winner += 1
+            yield line_number, line
+
+
+def unique_reservations(reservation_file: str, quarantine: Quarantine = None,
+                        expected_rows: int = None) -> Iterator[dict]:
+    """
+    Yields the converted reservations of a file, the latest row per reservationId
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     quarantine (Quarantine): Lenient mode, bad rows are written here instead of raising
+     expected_rows (int): Bloom filter size, see unique_lines
+
+    Returns:
+     reservations (Iterator): Reservations, usable with the report functions of task_g_dict
+    """
+    for line_number, line in unique_lines(reservation_file, expected_rows):
+        try:
+            yield convert_reservation_data(line.split("|"))
+        except ROW_ERRORS as e:
+            if quarantine is None:
+                raise
+            quarantine.add(line_number, line, e)
@@ -0,0 +1,192 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Approximate distinct counts of bookers and email domains (HyperLogLog)
+
+A sketch of precision p keeps 2**p one byte registers whatever the number
+of values, and its estimate has a standard error of about 1.04 / sqrt(2**p)
+(1.6 % at p = 12). Sketches of the same precision merge by taking the
+register maxima, so shards of a file can be counted in parallel and merged.
+A shard is a byte range of the file, so the shards split the reading too;
+compressed files cannot be entered in the middle and are read by shard 0
+alone. Values are hashed with blake2b, which is the same in every process.
+
+Example:
+ counts = merge_counts([distinct_counts("reservations.txt", shard, 4) for shard in range(4)])
+ print_distinct(counts)
+"""
+
+from collections.abc import Iterator
+from datetime import date
+from hashlib import blake2b
+from math import log
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from compressed_io import detect_opener, open_text
+from quarantine import ROW_ERRORS, Quarantine
+
+# Precisions of the per resource and month sketches and of the email domain sketch
+BOOKER_PRECISION: int = 10
+DOMAIN_PRECISION: int = 12
+
+
+class HyperLogLog:
+    """Mergeable distinct count sketch"""
+
+    def __init__(self, precision: int = 12):
+        """
+        Parameters:
+         precision (int): 4-16, the sketch uses 2**precision bytes
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("Precision must be between 4 and 16")
+        self.precision: int = precision
+        self.registers: bytearray = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """Adds one value, adding it again changes nothing"""
+        hashed: int = int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+        bits: int = 64 - self.precision
+        # The first bits pick the register, it keeps the longest run of leading zeros seen in the rest
+        index: int = hashed >> bits
+        rank: int = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Adds all values counted by other into this sketch"""
+        if other.precision != self.precision:
+            raise ValueError("Only sketches of the same precision can be merged")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values added"""
+        m: int = len(self.registers)
+        alpha: float = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw: float = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros: int = self.registers.count(0)
+        # Small counts: linear counting of the empty registers is more accurate
+        if raw <= 2.5 * m and zeros:
+            return m * log(m / zeros)
+        return raw
+
+    def size(self) -> int:
+        """Bytes used by the registers"""
+        return len(self.registers)
+
+
+def email_domain(email: str) -> str:
+    """Domain part of an email address, in lower case"""
+    return email.rpartition("@")[2].strip().lower()
+
+
+def shard_lines(reservation_file: str, shard: int = 0, shards: int = 1,
+                numbered: bool = False) -> Iterator[tuple[int, str]]:
+    """
+    Yields the line numbers and lines that start in one byte range of a file
+
+    The file is split in shards equal byte ranges and a line belongs to the range
+    its first byte is in. A compressed file is read whole by shard 0 and the
+    other shards get no lines.
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     shard (int): Which range, 0 .. shards - 1
+     shards (int): Number of ranges
+     numbered (bool): Count the lines before the range for correct line numbers, else they are None
+    """
+    if shards == 1 or detect_opener(reservation_file) is not None:
+        if shard == 0:
+            with open_text(reservation_file, encoding="utf-8") as f:
+                yield from enumerate(f, 1)
+        return
+    size: int = os.path.getsize(reservation_file)
+    start: int = size * shard // shards
+    end: int = size * (shard + 1) // shards
+    with open(reservation_file, "rb") as f:
+        line_number: int = None
+        if numbered:
+            line_number = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(min(1 << 20, start - f.tell())), b""))
+        if start > 0:
+            # Skip the rest of the line started in the previous range, none if start is at a line start
+            f.seek(start - 1)
+            skipped: bytes = f.readline()
+            if numbered and skipped != b"\n":
+                line_number += 1
+        position: int = f.tell()
+        while position < end:
+            line: bytes = f.readline()
+            if not line:
+                break
+            position += len(line)
+            if numbered:
+                line_number += 1
+            yield line_number, line.decode("utf-8")
+
+
+def distinct_counts(reservation_file: str, shard: int = 0, shards: int = 1, quarantine: Quarantine = None) -> dict:
+    """
+    Counts distinct bookers (by email) per resource and month, and distinct email domains, in one pass
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     shard (int): Count only the lines starting in this byte range of the file, see shard_lines
+     shards (int): Number of processes sharing the file
+     quarantine (Quarantine): Lenient mode, bad rows are written here instead of raising
+
+    Returns:
+     counts (dict): 'bookers' maps (resource, 'mm/yyyy') to a sketch, 'domains' is one sketch
+    """
+    bookers: dict[tuple[str, str], HyperLogLog] = {}
+    domains: HyperLogLog = HyperLogLog(DOMAIN_PRECISION)
+    for line_number, line in shard_lines(reservation_file, shard, shards, quarantine is not None):
+        if len(line) <= 1:
+            continue
+        # Only the three columns needed are converted, as convert_reservation_data would
+        try:
+            fields: list[str] = line.split("|")
+            day: date = date.fromisoformat(fields[4])
+            email: str = str(fields[2]).strip().lower()
+            group: tuple[str, str] = (str(fields[9]), f"{day.month:02d}/{day.year}")
+        except ROW_ERRORS as e:
+            if quarantine is None:
+                raise
+            quarantine.add(line_number, line, e)
+            continue
+        if group not in bookers:
+            bookers[group] = HyperLogLog(BOOKER_PRECISION)
+        bookers[group].add(email)
+        domains.add(email_domain(email))
+    return {"bookers": bookers, "domains": domains}
+
+
+def merge_counts(parts: list[dict]) -> dict:
+    """Combines results of distinct_counts, e.g. from parallel shards, into a new one"""
+    bookers: dict[tuple[str, str], HyperLogLog] = {}
+    domains: HyperLogLog = HyperLogLog(DOMAIN_PRECISION)
+    for part in parts:
+        for group, sketch in part["bookers"].items():
+            bookers.setdefault(group, HyperLogLog(sketch.precision)).merge(sketch)
+        domains.merge(part["domains"])
+    return {"bookers": bookers, "domains": domains}
+
+
+def print_distinct(counts: dict) -> None:
+    """
+    Prints the distinct bookers per resource and month and the distinct email domains
+
+    Parameters:
+     counts (dict): Result of distinct_counts or merge_counts
+    """
+    # Sorted by resource, then by month in time order
+    for (resource, month), sketch in sorted(counts["bookers"].items(), key=lambda item: (item[0][0], item[0][1][3:], item[0][1])):
+        print(f"- {resource}, {month}: ~{sketch.estimate():.0f} distinct bookers")
+    print(f'Distinct email domains: ~{counts["domains"].estimate():.0f}')
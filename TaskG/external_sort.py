@@ -0,0 +1,168 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Sorted reports for reservation files larger than memory
+
+Converted reservations (task_g_dict) are sorted in runs of run_size, each
+run is written to a temporary file, and the runs are merged with a heap.
+Only one run plus one reservation per open run file are in memory at a time.
+
+sort_to_run writes the sorted reservations of several files to one run file
+instead, which can be read many times with read_run(path, keep=True).
+
+Example:
+ confirmed_reservations(sorted_reservations("reservations.txt", "date"))
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+import heapq
+from itertools import islice
+import os
+import pickle
+import sys
+import tempfile
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from compressed_io import open_text
+from quarantine import ROW_ERRORS, Quarantine
+from task_g_dict import convert_reservation_data
+
+# Sort orders, ties are broken by the reservation id so the order is stable
+SORT_KEYS: dict[str, Callable] = {
+    "date": lambda r: (r["date"], r["time"], r["id"]),
+    "resource": lambda r: (r["resource"], r["date"], r["time"], r["id"]),
+    "created": lambda r: (r["created"], r["id"]),
+    "id": lambda r: r["id"],
+}
+# Most run files merged at once, more runs are merged in several passes
+FAN_IN: int = 64
+# Reservations pickled together in a run file, one pickle per reservation is slow to load
+RUN_BLOCK: int = 1024
+
+
+def write_run(reservations: Iterable[dict], folder: str) -> str:
+    """
+    Writes already sorted reservations to a new run file
+
+    Parameters:
+     reservations (Iterable): Sorted reservations
+     folder (str): Folder for the run file
+
+    Returns:
+     path (str): Name of the run file
+    """
+    handle, path = tempfile.mkstemp(suffix=".run", dir=folder)
+    reservations = iter(reservations)
+    with os.fdopen(handle, "wb") as f:
+        while block := list(islice(reservations, RUN_BLOCK)):
+            pickle.dump(block, f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def read_run(path: str, keep: bool = False) -> Iterator[dict]:
+    """
+    Reads reservations back from a run file, deleting the file when done
+
+    Parameters:
+     path (str): Name of the run file
+     keep (bool): Leave the file in place, to read it again
+    """
+    with open(path, "rb") as f:
+        while True:
+            try:
+                block: list[dict] = pickle.load(f)
+            except EOFError:
+                break
+            yield from block
+    if not keep:
+        os.remove(path)
+
+
+def spill_runs(reservation_file: str, key: Callable, run_size: int, folder: str,
+               quarantine: Quarantine = None) -> list[str]:
+    """
+    Reads and converts reservations, writing every run_size of them as a sorted run
+
+    Returns:
+     runs (list): Names of the run files
+    """
+    runs: list[str] = []
+    run: list[dict] = []
+    with open_text(reservation_file, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if len(line) > 1:
+                try:
+                    run.append(convert_reservation_data(line.split("|")))
+                except ROW_ERRORS as e:
+                    # Lenient mode: set the row aside and continue
+                    if quarantine is None:
+                        raise
+                    quarantine.add(line_number, line, e)
+                    continue
+                if len(run) >= run_size:
+                    run.sort(key=key)
+                    runs.append(write_run(run, folder))
+                    run = []
+    if run:
+        run.sort(key=key)
+        runs.append(write_run(run, folder))
+    return runs
+
+
+def merge_runs(runs: list[str], key: Callable, folder: str) -> list[str]:
+    """Merges run files in passes of FAN_IN until at most FAN_IN are left, to keep the open files bounded"""
+    while len(runs) > FAN_IN:
+        runs = [write_run(heapq.merge(*[read_run(run) for run in runs[i:i + FAN_IN]], key=key), folder)
+                for i in range(0, len(runs), FAN_IN)]
+    return runs
+
+
+def sorted_reservations(reservation_file: str, by: str = "date", run_size: int = 100000,
+                        quarantine: Quarantine = None) -> Iterator[dict]:
+    """
+    Yields the converted reservations of a file in sorted order using an external merge sort
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     by (str): Sort order, one of SORT_KEYS
+     run_size (int): Reservations sorted in memory at a time
+     quarantine (Quarantine): Lenient mode, bad rows are written here instead of raising
+
+    Returns:
+     reservations (Iterator): Reservations, usable with the report functions of task_g_dict
+    """
+    key: Callable = SORT_KEYS[by]
+    with tempfile.TemporaryDirectory() as folder:
+        runs: list[str] = merge_runs(spill_runs(reservation_file, key, run_size, folder, quarantine), key, folder)
+        yield from heapq.merge(*[read_run(run) for run in runs], key=key)
+
+
+def sort_to_run(reservation_files: list[str], by: str, folder: str, run_size: int = 100000,
+                quarantine: Quarantine = None) -> str:
+    """
+    Sorts the reservations of several files into one run file
+
+    Parameters:
+     reservation_files (list): Names of the files containing the reservations
+     by (str): Sort order, one of SORT_KEYS
+     folder (str): Folder for the run files, e.g. a tempfile.TemporaryDirectory
+     run_size (int): Reservations sorted in memory at a time
+     quarantine (Quarantine): Lenient mode, bad rows are written here instead of raising
+
+    Returns:
+     path (str): Name of the run file, read it with read_run(path, keep=True)
+    """
+    key: Callable = SORT_KEYS[by]
+    runs: list[str] = [run for reservation_file in reservation_files
+                       for run in spill_runs(reservation_file, key, run_size, folder, quarantine)]
+    runs = merge_runs(runs, key, folder)
+    # A single spilled run is already the sorted file
+    if len(runs) == 1:
+        return runs[0]
+    return write_run(heapq.merge(*[read_run(run) for run in runs], key=key), folder)
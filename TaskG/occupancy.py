@@ -0,0 +1,168 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Hourly occupancy of reserved resources, built from reservations converted
+by task_g_dict.convert_reservation_data
+
+Each resource gets one bitmap stored in a Python int: bit i is set when the
+resource is reserved during hour i counted from the start of the first
+reservation day. Utilisation, heatmaps and free slot searches are done with
+bit operations on whole bitmaps instead of looping over reservations.
+"""
+
+from datetime import date, datetime, timedelta
+
+WEEKDAYS: list[str] = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+class Occupancy:
+    """Hourly occupancy bitmaps of all resources"""
+
+    def __init__(self, reservations: list[dict], confirmed_only: bool = False, origin: date = None):
+        """
+        Parameters:
+         reservations (list): Reservations from fetch_reservations (dict version)
+         confirmed_only (bool): Leave out reservations that are not confirmed
+         origin (date): First day of the bitmaps, by default the first reservation day
+        """
+        used: list[dict] = [r for r in reservations if r["confirmed"] or not confirmed_only]
+        first: date = origin or min((r["date"] for r in used), default=date.today())
+        self.origin: datetime = datetime.combine(first, datetime.min.time())
+        self.hours: int = 0
+        self.bitmaps: dict[str, int] = {}
+        for reservation in used:
+            self.reserve(reservation["resource"], datetime.combine(reservation["date"], reservation["time"]),
+                         reservation["duration"])
+
+    def hour_index(self, moment: datetime) -> int:
+        """Returns the bit number of the hour containing moment"""
+        return int((moment - self.origin).total_seconds() // 3600)
+
+    def slot_mask(self, start: datetime, duration: int) -> int:
+        """
+        Returns a mask of the hours touched by a reservation, a 15:45 start touches the 15 hour
+
+        Parameters:
+         start (datetime): Start of the reservation
+         duration (int): Length in hours
+        """
+        first: int = self.hour_index(start)
+        if first < 0:
+            raise ValueError(f"Reservation at {start} is before the start of the bitmap {self.origin}")
+        end: datetime = start + timedelta(hours=duration)
+        last: int = self.hour_index(end - timedelta(microseconds=1))
+        return ((1 << (last - first + 1)) - 1) << first
+
+    def reserve(self, resource: str, start: datetime, duration: int) -> None:
+        """
+        Marks the hours touched by a reservation as occupied
+
+        Parameters:
+         resource (str): Reserved resource
+         start (datetime): Start of the reservation
+         duration (int): Length in hours
+        """
+        mask: int = self.slot_mask(start, duration)
+        self.bitmaps[resource] = self.bitmaps.get(resource, 0) | mask
+        self.hours = max(self.hours, mask.bit_length())
+
+    def window(self, start: datetime, end: datetime) -> int:
+        """Returns a mask of the hours from start (inclusive) to end (exclusive), hours before the origin left out"""
+        first: int = max(self.hour_index(start), 0)
+        last: int = self.hour_index(end)
+        return ((1 << max(last - first, 0)) - 1) << first
+
+    def utilisation(self, resource: str, start: datetime, end: datetime) -> float:
+        """
+        Returns the share of hours the resource is reserved in a period, in percent
+
+        Parameters:
+         resource (str): Resource
+         start (datetime): Start of the period
+         end (datetime): End of the period (exclusive)
+        """
+        # Hours before the origin have no bits but are free hours of the period all the same
+        hours: float = (end - start) / timedelta(hours=1)
+        if hours <= 0:
+            return 0.0
+        return (self.bitmaps.get(resource, 0) & self.window(start, end)).bit_count() / hours * 100
+
+    def heatmap(self, resource: str) -> list[list[float]]:
+        """
+        Returns the utilisation of each hour of the week over the whole bitmap
+
+        Returns:
+         heatmap (list): 7 rows (Monday first) of 24 percentages
+        """
+        bitmap: int = self.bitmaps.get(resource, 0)
+        weeks: int = self.hours // 168 + 1
+        # Bits 0, 168, 336, ... : the same hour in every week
+        every_week: int = int(("0" * 167 + "1") * weeks, 2)
+        offset: int = self.origin.weekday() * 24
+        result: list[list[float]] = [[0.0] * 24 for _ in range(7)]
+        for slot in range(168):
+            # Bit number of this hour of week in the first week of the bitmap
+            shift: int = (slot - offset) % 168
+            mask: int = (every_week << shift) & ((1 << self.hours) - 1)
+            total: int = mask.bit_count()
+            if total:
+                result[slot // 24][slot % 24] = (bitmap & mask).bit_count() / total * 100
+        return result
+
+    def next_free(self, resource: str, hours: int, after: datetime) -> datetime:
+        """
+        Finds the start of the first free period of whole hours
+
+        Parameters:
+         resource (str): Resource
+         hours (int): Length of the wanted period
+         after (datetime): Earliest start, rounded up to a full hour
+
+        Returns:
+         start (datetime): Start of the first free period
+        """
+        start: int = max(-(-(after - self.origin) // timedelta(hours=1)), 0)
+        # Every hour after the last reservation is free, so the answer is at most here
+        limit: int = max(self.hours, start) + hours
+        free: int = ~self.bitmaps.get(resource, 0) & ((1 << limit) - 1)
+        # After this loop bit i is set only if hours i .. i+hours-1 are all free
+        length: int = 1
+        while length < hours:
+            step: int = min(length, hours - length)
+            free &= free >> step
+            length += step
+        free >>= start
+        first: int = (free & -free).bit_length() - 1
+        return self.origin + timedelta(hours=start + first)
+
+
+def print_heatmap(heatmap: list[list[float]]) -> None:
+    """
+    Prints a heatmap from Occupancy.heatmap as a table of whole percentages
+
+    Parameters:
+     heatmap (list): 7 x 24 percentages
+    """
+    print("    " + "".join(f"{hour:>4}" for hour in range(24)))
+    for day, row in zip(WEEKDAYS, heatmap):
+        print(f"{day} " + "".join(f"{value:>4.0f}" for value in row))
+
+
+def utilisation_report(occupancy: Occupancy, start: datetime, end: datetime) -> None:
+    """
+    Prints the utilisation of every resource in a period
+
+    Parameters:
+     occupancy (Occupancy): Occupancy bitmaps
+     start (datetime): Start of the period
+     end (datetime): End of the period (exclusive)
+    """
+    for resource in sorted(occupancy.bitmaps):
+        percent: float = occupancy.utilisation(resource, start, end)
+        print(f"- {resource}: {percent:.1f} %".replace(".", ","))
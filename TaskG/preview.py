@@ -0,0 +1,144 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Approximate total revenue and confirmation summary from a random sample
+
+The file is read once without converting anything: every line gets a random
+priority and the lines with the smallest priorities are kept. Any prefix of
+that sample is itself a uniform random sample, so estimates can be refined
+step by step by converting more of it, and finally replaced by the exact
+result. Margins are 95 % confidence intervals.
+"""
+
+from collections.abc import Iterator
+import heapq
+from math import sqrt
+import os
+import random
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from compressed_io import open_text
+from fi_format import format_number
+from task_g_dict import convert_reservation_data, fetch_reservations
+
+# Normal distribution quantile for a 95 % confidence interval
+Z: float = 1.96
+
+
+def priority_sample(reservation_file: str, size: int, seed: int = None) -> tuple[int, list[str]]:
+    """
+    Picks a uniform random sample of lines in one pass (reservoir sampling with priorities)
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     size (int): Largest sample wanted
+     seed (int): Random seed for repeatable samples
+
+    Returns:
+     population (int): Number of reservation lines in the file
+     sample (list): Sampled lines, every prefix is a uniform sample
+    """
+    generator: random.Random = random.Random(seed)
+    # Max-heap of the smallest priorities via negated keys
+    heap: list[tuple[float, str]] = []
+    population: int = 0
+    with open_text(reservation_file, encoding="utf-8") as f:
+        for line in f:
+            if len(line) > 1:
+                population += 1
+                key: float = generator.random()
+                if len(heap) < size:
+                    heapq.heappush(heap, (-key, line))
+                elif key < -heap[0][0]:
+                    heapq.heapreplace(heap, (-key, line))
+    return population, [line for _, line in sorted(heap, reverse=True)]
+
+
+def estimate_total(values: list[float], population: int) -> tuple[float, float]:
+    """
+    Estimates the population total from a simple random sample
+
+    Parameters:
+     values (list): Sampled values
+     population (int): Size of the population
+
+    Returns:
+     estimate (float): Estimated total
+     margin (float): Half width of the 95 % confidence interval
+    """
+    n: int = len(values)
+    if n == 0:
+        return 0.0, 0.0
+    mean: float = sum(values) / n
+    variance: float = sum((value - mean) ** 2 for value in values) / (n - 1) if n > 1 else 0.0
+    # Finite population correction, the margin is 0 once everything is sampled
+    correction: float = max(population - n, 0) / population
+    return population * mean, Z * population * sqrt(variance / n * correction)
+
+
+def estimates(reservations: list[dict], population: int) -> dict[str, tuple[float, float]]:
+    """
+    Estimates revenue and confirmations from converted sample reservations
+
+    Returns:
+     estimates (dict): 'revenue' and 'confirmed' as (estimate, margin)
+    """
+    return {
+        "revenue": estimate_total([r["price"] * r["duration"] if r["confirmed"] else 0.0 for r in reservations], population),
+        "confirmed": estimate_total([1.0 if r["confirmed"] else 0.0 for r in reservations], population),
+    }
+
+
+def progressive_preview(reservation_file: str, steps: tuple = (100, 1000, 10000),
+                        exact: bool = True, seed: int = None) -> Iterator[dict]:
+    """
+    Yields better and better estimates, and last the exact values
+
+    Parameters:
+     reservation_file (str): Name of the file containing the reservations
+     steps (tuple): Sample sizes of the successive estimates
+     exact (bool): Finish with the exact result computed from the whole file
+     seed (int): Random seed for repeatable samples
+
+    Returns:
+     previews (Iterator): Dictionaries with 'rows' (sample size), 'population',
+     'exact' and 'revenue' / 'confirmed' as (estimate, margin)
+    """
+    population, sample = priority_sample(reservation_file, max(steps), seed)
+    converted: list[dict] = []
+    for step in steps:
+        for line in sample[len(converted):step]:
+            converted.append(convert_reservation_data(line.split("|")))
+        yield {"rows": len(converted), "population": population, "exact": False, **estimates(converted, population)}
+        if len(converted) == population:
+            break
+    if exact:
+        reservations: list[dict] = fetch_reservations(reservation_file)
+        result: dict[str, tuple[float, float]] = estimates(reservations, len(reservations))
+        yield {"rows": len(reservations), "population": len(reservations), "exact": True, **result}
+
+
+def print_preview(preview: dict) -> None:
+    """
+    Prints one preview in the format of confirmation_summary and total_revenue
+
+    Parameters:
+     preview (dict): One result of progressive_preview
+    """
+    confirmed, confirmed_margin = preview["confirmed"]
+    revenue, revenue_margin = preview["revenue"]
+    if preview["exact"]:
+        print(f'- Confirmed reservations: {confirmed:.0f} pcs\n- Not confirmed reservations: {preview["population"] - confirmed:.0f} pcs')
+        print(f'Total revenue from confirmed reservations: {format_number(revenue)} €')
+        return
+    print(f'Preview from {preview["rows"]} of {preview["population"]} reservations (95 % confidence)')
+    print(f'- Confirmed reservations: ~{confirmed:.0f} ± {confirmed_margin:.0f} pcs')
+    print(f'- Not confirmed reservations: ~{preview["population"] - confirmed:.0f} ± {confirmed_margin:.0f} pcs')
+    print(f'Total revenue from confirmed reservations: ~{format_number(revenue)} ± {format_number(revenue_margin)} €')
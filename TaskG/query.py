@@ -0,0 +1,251 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Small query language for reservations converted by task_g_dict
+
+Example:
+ confirmed and duration >= 3 and resource == 'Forest Area 1'
+
+Fields are the keys of the reservation dictionaries (id, name, email, phone,
+date, time, duration, price, confirmed, resource, created). Conditions are
+field OP value with OP one of == != < <= > >=, or a field alone for its truth
+value, combined with and, or, not and parentheses. Values are numbers,
+True/False or quoted strings; dates are written '2025-11-12', times '09:00'
+and createdAt '2025-08-12 14:33:20'.
+
+A query is parsed once and compiled to a Python function for lists of
+reservations, or to NumPy mask operations for a columnar table (to_columns).
+"""
+
+from collections.abc import Callable
+from datetime import date, datetime, time
+import operator
+import re
+
+# Conversion of quoted values for fields that are not strings
+FIELD_TYPES: dict[str, Callable] = {
+    "id": int,
+    "name": str,
+    "email": str,
+    "phone": str,
+    "date": lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+    "time": lambda value: datetime.strptime(value, "%H:%M").time(),
+    "duration": int,
+    "price": float,
+    "confirmed": lambda value: value == "True",
+    "resource": str,
+    "created": lambda value: datetime.strptime(value, "%Y-%m-%d %H:%M:%S"),
+}
+OPERATORS: dict[str, Callable] = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+}
+TOKEN = re.compile(r"\s*(?:(?P<number>-?\d+(?:\.\d+)?)|(?P<string>'[^']*'|\"[^\"]*\")"
+                   r"|(?P<op>==|!=|<=|>=|<|>)|(?P<paren>[()])|(?P<word>\w+))")
+
+
+def tokenize(text: str) -> list[tuple[str, str]]:
+    """
+    Splits a query into (kind, text) tokens
+
+    Parameters:
+     text (str): Query
+    """
+    tokens: list[tuple[str, str]] = []
+    position: int = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"Unexpected character at {position}: {text[position:]!r}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+class Parser:
+    """Recursive descent parser producing a tree of tuples"""
+
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self) -> tuple[str, str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", "")
+
+    def take(self) -> tuple[str, str]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> tuple:
+        tree = self.parse_or()
+        if self.peek()[0] != "end":
+            raise ValueError(f"Unexpected {self.peek()[1]!r}")
+        return tree
+
+    def parse_or(self) -> tuple:
+        tree = self.parse_and()
+        while self.peek() == ("word", "or"):
+            self.take()
+            tree = ("or", tree, self.parse_and())
+        return tree
+
+    def parse_and(self) -> tuple:
+        tree = self.parse_not()
+        while self.peek() == ("word", "and"):
+            self.take()
+            tree = ("and", tree, self.parse_not())
+        return tree
+
+    def parse_not(self) -> tuple:
+        if self.peek() == ("word", "not"):
+            self.take()
+            return ("not", self.parse_not())
+        return self.parse_condition()
+
+    def parse_condition(self) -> tuple:
+        kind, text = self.take()
+        if (kind, text) == ("paren", "("):
+            tree = self.parse_or()
+            if self.take() != ("paren", ")"):
+                raise ValueError("Missing )")
+            return tree
+        if kind != "word" or text not in FIELD_TYPES:
+            raise ValueError(f"Unknown field {text!r}")
+        if self.peek()[0] != "op":
+            return ("field", text)
+        op: str = self.take()[1]
+        return ("compare", op, text, self.parse_value(text))
+
+    def parse_value(self, field: str):
+        kind, text = self.take()
+        try:
+            if kind == "string":
+                return FIELD_TYPES[field](text[1:-1])
+            if kind == "number":
+                return FIELD_TYPES[field](text)
+            if kind == "word" and text in ("True", "False"):
+                return text == "True"
+        except ValueError as e:
+            raise ValueError(f"Bad value {text} for {field}: {e}") from e
+        raise ValueError(f"Expected a value after {field}, got {text!r}")
+
+
+def compile_function(tree: tuple) -> Callable[[dict], bool]:
+    """
+    Compiles a parsed query into a function of one reservation dictionary
+
+    Parameters:
+     tree (tuple): Tree from Parser.parse
+    """
+    kind = tree[0]
+    if kind == "compare":
+        _, op, field, value = tree
+        compare = OPERATORS[op]
+        return lambda reservation: compare(reservation[field], value)
+    if kind == "field":
+        field = tree[1]
+        return lambda reservation: bool(reservation[field])
+    if kind == "not":
+        inner = compile_function(tree[1])
+        return lambda reservation: not inner(reservation)
+    left, right = compile_function(tree[1]), compile_function(tree[2])
+    if kind == "and":
+        return lambda reservation: left(reservation) and right(reservation)
+    return lambda reservation: left(reservation) or right(reservation)
+
+
+def numpy_value(value):
+    """Converts a query value into the type used by to_columns"""
+    import numpy as np
+    if isinstance(value, datetime):
+        return np.datetime64(value, "s")
+    if isinstance(value, date):
+        return np.datetime64(value, "D")
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    return value
+
+
+def compile_mask(tree: tuple) -> Callable:
+    """
+    Compiles a parsed query into a function of a columnar table returning a boolean mask
+
+    Parameters:
+     tree (tuple): Tree from Parser.parse
+    """
+    kind = tree[0]
+    if kind == "compare":
+        _, op, field, value = tree
+        compare = OPERATORS[op]
+        value = numpy_value(value)
+        return lambda table: compare(table[field], value)
+    if kind == "field":
+        field = tree[1]
+        return lambda table: table[field].astype(bool)
+    if kind == "not":
+        inner = compile_mask(tree[1])
+        return lambda table: ~inner(table)
+    left, right = compile_mask(tree[1]), compile_mask(tree[2])
+    if kind == "and":
+        return lambda table: left(table) & right(table)
+    return lambda table: left(table) | right(table)
+
+
+def to_columns(reservations: list[dict]) -> dict:
+    """
+    Builds a columnar table (one NumPy array per field) from reservations
+
+    Times are stored as minutes after midnight, dates as datetime64.
+
+    Parameters:
+     reservations (list): Reservations from fetch_reservations (dict version)
+    """
+    import numpy as np
+    return {
+        "id": np.array([r["id"] for r in reservations], dtype=np.int64),
+        "name": np.array([r["name"] for r in reservations], dtype=str),
+        "email": np.array([r["email"] for r in reservations], dtype=str),
+        "phone": np.array([r["phone"] for r in reservations], dtype=str),
+        "date": np.array([r["date"] for r in reservations], dtype="datetime64[D]"),
+        "time": np.array([r["time"].hour * 60 + r["time"].minute for r in reservations], dtype=np.int64),
+        "duration": np.array([r["duration"] for r in reservations], dtype=np.int64),
+        "price": np.array([r["price"] for r in reservations], dtype=np.float64),
+        "confirmed": np.array([r["confirmed"] for r in reservations], dtype=bool),
+        "resource": np.array([r["resource"] for r in reservations], dtype=str),
+        "created": np.array([r["created"] for r in reservations], dtype="datetime64[s]"),
+    }
+
+
+class Query:
+    """A parsed query, compiled on first use for lists or columnar tables"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tree = Parser(text).parse()
+        self.function = compile_function(self.tree)
+        self.mask_function = None
+
+    def matches(self, reservation: dict) -> bool:
+        """Tells if one reservation matches the query"""
+        return self.function(reservation)
+
+    def filter(self, reservations: list[dict]) -> list[dict]:
+        """Returns the matching reservations, usable with the report functions"""
+        return [reservation for reservation in reservations if self.function(reservation)]
+
+    def mask(self, table: dict):
+        """Returns a boolean NumPy array telling which rows of a to_columns table match"""
+        if self.mask_function is None:
+            self.mask_function = compile_mask(self.tree)
+        return self.mask_function(table)
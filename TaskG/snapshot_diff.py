@@ -0,0 +1,203 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+What changed between two snapshots of a reservation file
+
+Reservations are joined on reservationId:
+
+ hash join   The old snapshot is indexed in a dictionary of raw lines and the
+             new one is streamed against it. Identical lines are skipped
+             without converting them.
+ merge join  Both snapshots are sorted by id with external_sort and walked
+             side by side, for files that do not fit in memory.
+
+A change is a tuple (kind, old, new) with kind "added", "removed" or
+"changed" and the converted reservations (None where missing). Both joins
+yield the changes in id order. Ids are expected to be unique within a
+snapshot, dedup.py removes repeats.
+
+Example:
+ print_diff(diff_snapshots("yesterday.txt", "today.txt"))
+"""
+
+from collections.abc import Iterator
+from datetime import date, datetime, time
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from compressed_io import open_text
+from external_sort import sorted_reservations
+from fi_format import format_date, format_number, format_time
+from task_g_dict import convert_reservation_data
+
+# Fields compared between the snapshots, in change log order
+FIELDS: list[str] = ["name", "email", "phone", "date", "time", "duration", "price", "confirmed", "resource", "created"]
+# Old snapshots larger than this are merge joined instead of indexed in memory
+HASH_JOIN_MAX_BYTES: int = 256 * 1024 * 1024
+
+
+def read_lines(reservation_file: str) -> Iterator[tuple[int, str]]:
+    """Reservation ids and raw lines of a file, without the line ends"""
+    with open_text(reservation_file, encoding="utf-8") as f:
+        for line in f:
+            if len(line) > 1:
+                line = line.rstrip("\n")
+                yield int(line.split("|", 1)[0]), line
+
+
+def changed_fields(old: dict, new: dict) -> list[str]:
+    """Names of the fields that differ between two versions of a reservation"""
+    return [field for field in FIELDS if old[field] != new[field]]
+
+
+def hash_join(old_file: str, new_file: str) -> Iterator[tuple[str, dict, dict]]:
+    """
+    Yields the changes between two snapshots, indexing the old one in memory
+
+    The changes are collected and sorted by id, so the order matches merge_join.
+
+    Parameters:
+     old_file (str): Earlier snapshot
+     new_file (str): Later snapshot
+    """
+    old_lines: dict[int, str] = dict(read_lines(old_file))
+    changes: list[tuple[int, str, dict, dict]] = []
+    for reservation_id, line in read_lines(new_file):
+        old_line: str = old_lines.pop(reservation_id, None)
+        if old_line is None:
+            changes.append((reservation_id, "added", None, convert_reservation_data(line.split("|"))))
+        elif old_line != line:
+            old: dict = convert_reservation_data(old_line.split("|"))
+            new: dict = convert_reservation_data(line.split("|"))
+            # Lines may differ only in formatting, e.g. 18.5 and 18.50
+            if changed_fields(old, new):
+                changes.append((reservation_id, "changed", old, new))
+    for reservation_id, line in old_lines.items():
+        changes.append((reservation_id, "removed", convert_reservation_data(line.split("|")), None))
+    changes.sort(key=lambda change: change[0])
+    for _, kind, old, new in changes:
+        yield kind, old, new
+
+
+def merge_join(old_file: str, new_file: str, run_size: int = 100000) -> Iterator[tuple[str, dict, dict]]:
+    """
+    Yields the changes between two snapshots by walking both sorted by id
+
+    Parameters:
+     old_file (str): Earlier snapshot
+     new_file (str): Later snapshot
+     run_size (int): Reservations sorted in memory at a time, see external_sort
+    """
+    olds: Iterator[dict] = sorted_reservations(old_file, "id", run_size)
+    news: Iterator[dict] = sorted_reservations(new_file, "id", run_size)
+    old: dict = next(olds, None)
+    new: dict = next(news, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old["id"] < new["id"]):
+            yield "removed", old, None
+            old = next(olds, None)
+        elif old is None or new["id"] < old["id"]:
+            yield "added", None, new
+            new = next(news, None)
+        else:
+            if changed_fields(old, new):
+                yield "changed", old, new
+            old = next(olds, None)
+            new = next(news, None)
+
+
+def diff_snapshots(old_file: str, new_file: str, merge: bool = None) -> Iterator[tuple[str, dict, dict]]:
+    """
+    Yields the changes between two snapshots
+
+    Parameters:
+     old_file (str): Earlier snapshot
+     new_file (str): Later snapshot
+     merge (bool): Use the merge join, by default when the old file is over HASH_JOIN_MAX_BYTES
+
+    Returns:
+     changes (Iterator): (kind, old, new) tuples, see the module docstring
+    """
+    if merge is None:
+        merge = os.path.getsize(old_file) > HASH_JOIN_MAX_BYTES
+    return merge_join(old_file, new_file) if merge else hash_join(old_file, new_file)
+
+
+def revenue(reservation: dict) -> float:
+    """Revenue of one reservation as total_revenue counts it, only confirmed reservations count"""
+    if reservation is None or not reservation["confirmed"]:
+        return 0.0
+    return reservation["price"] * reservation["duration"]
+
+
+def describe(reservation: dict) -> str:
+    """One reservation in the style of the reports"""
+    return (f'{reservation["id"]} {reservation["name"]}, {reservation["resource"]}, {format_date(reservation["date"])} '
+            f'at {format_time(reservation["time"])}, {reservation["duration"]} h, {format_number(reservation["price"])} €'
+            f'{"" if reservation["confirmed"] else ", not confirmed"}')
+
+
+def format_value(value: object) -> str:
+    """A field value in the style of the reports"""
+    if isinstance(value, bool):
+        return "confirmed" if value else "not confirmed"
+    if isinstance(value, float):
+        return format_number(value)
+    if isinstance(value, datetime):
+        return value.strftime("%d.%m.%Y %H:%M:%S")
+    if isinstance(value, date):
+        return format_date(value)
+    if isinstance(value, time):
+        return format_time(value)
+    return str(value)
+
+
+def change_line(kind: str, old: dict, new: dict) -> str:
+    """One line of the change log: + added, x removed, ~ changed fields"""
+    if kind == "added":
+        return f"+ {describe(new)}"
+    if kind == "removed":
+        return f"x {describe(old)}"
+    changes: str = ", ".join(f"{field} {format_value(old[field])} → {format_value(new[field])}"
+                             for field in changed_fields(old, new))
+    return f'~ {new["id"]} {new["name"]}: {changes}'
+
+
+def print_diff(changes: Iterator[tuple[str, dict, dict]]) -> dict:
+    """
+    Prints the change log and the delta aggregates of a diff
+
+    Parameters:
+     changes (Iterator): Result of diff_snapshots
+
+    Returns:
+     totals (dict): Counts per kind, newly confirmed / unconfirmed, revenue and confirmation deltas
+    """
+    totals: dict = {"added": 0, "removed": 0, "changed": 0, "confirmed": 0, "unconfirmed": 0,
+                    "confirmed_delta": 0, "revenue_delta": 0.0}
+    for kind, old, new in changes:
+        print(change_line(kind, old, new))
+        totals[kind] += 1
+        was: bool = old is not None and old["confirmed"]
+        now: bool = new is not None and new["confirmed"]
+        if kind == "changed" and was != now:
+            totals["confirmed" if now else "unconfirmed"] += 1
+        totals["confirmed_delta"] += now - was
+        totals["revenue_delta"] += revenue(new) - revenue(old)
+    # The totals are set apart from the change log, as the reports list their counts with "- "
+    print("Totals")
+    print(f'- New reservations: {totals["added"]} pcs\n- Removed reservations: {totals["removed"]} pcs\n'
+          f'- Changed reservations: {totals["changed"]} pcs, {totals["confirmed"]} newly confirmed, '
+          f'{totals["unconfirmed"]} no longer confirmed')
+    print(f'Change in confirmed reservations: {totals["confirmed_delta"]:+d} pcs')
+    # Rounded first so float noise does not print as -0,00
+    delta: float = round(totals["revenue_delta"], 2)
+    print(f'Change in revenue from confirmed reservations: {"-" if delta < 0 else "+"}{format_number(abs(delta))} €')
+    return totals
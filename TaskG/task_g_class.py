@@ -21,6 +21,13 @@ int | str | str | str | date | time | int | float | bool | str | datetime
 """
 
 from datetime import datetime
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from compressed_io import open_text
+from quarantine import ROW_ERRORS, Quarantine
+from fi_format import format_date, format_number, format_time
 
 class Reservation:
     def __init__(self, reservation_id, name, email, phone,
@@ -73,13 +80,14 @@ def convert_reservation_data(reservation: list) -> Reservation:
     return Reservation(r_id, name, email, phone, date, time, duration, price, confirmed, reservedResource, created)
 
 
-def fetch_reservations(reservation_file: str) -> list[Reservation]:
+def fetch_reservations(reservation_file: str, quarantine: Quarantine = None) -> list[Reservation]:
     """
     Reads reservations from a file and returns the reservations converted
     You don't need to modify this function!
 
     Parameters:
      reservation_file (str): Name of the file containing the reservations
+     quarantine (Quarantine): Lenient mode, bad rows are written here instead of raising
 
     Returns:
      reservations (list): Read and converted reservations
@@ -100,11 +108,17 @@ def fetch_reservations(reservation_file: str) -> list[Reservation]:
             "createdAt",
         ]
     )
-    with open(reservation_file, "r", encoding="utf-8") as f:
-        for line in f:
+    with open_text(reservation_file, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
             if len(line) > 1:
                 fields = line.split("|")
-                reservations.append(convert_reservation_data(fields))
+                try:
+                    reservations.append(convert_reservation_data(fields))
+                except ROW_ERRORS as e:
+                    # Lenient mode: set the row aside and continue
+                    if quarantine is None:
+                        raise
+                    quarantine.add(line_number, line, e)
     return reservations
 
 def confirmed_reservations(reservations: list[Reservation]) -> None:
@@ -116,7 +130,7 @@ def confirmed_reservations(reservations: list[Reservation]) -> None:
     """
     for reservation in reservations[1:]:
         if reservation.is_confirmed(): # If confirmed
-            print(f'- {reservation.name}, {reservation.resource}, {reservation.date.strftime("%d.%m.%Y")} at {reservation.time.strftime("%H.%M")}')
+            print(f'- {reservation.name}, {reservation.resource}, {format_date(reservation.date)} at {format_time(reservation.time)}')
 
 def long_reservations(reservations : list[Reservation]) -> None:
     """
@@ -127,7 +141,7 @@ def long_reservations(reservations : list[Reservation]) -> None:
     """
     for reservation in reservations[1:]:
         if reservation.is_long(): # If long
-            print(f'- {reservation.name}, {reservation.date.strftime("%d.%m.%Y")} at {reservation.time.strftime("%H.%M")}, duration {reservation.duration} h, {reservation.resource}')
+            print(f'- {reservation.name}, {format_date(reservation.date)} at {format_time(reservation.time)}, duration {reservation.duration} h, {reservation.resource}')
 
 
 def confirmation_statuses(reservations: list[Reservation]) -> None:
@@ -160,8 +174,8 @@ def total_revenue(reservations: list[Reservation]) -> None:
     Parameters:
      reservations (list): Reservations
     """
-    revenue : float = sum([x.price * x.duration for x in reservations[1:]])
-    print(f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace('.', ','))
+    revenue : float = sum([x.price * x.duration for x in reservations[1:] if x.confirmed])
+    print(f'Total revenue from confirmed reservations: {format_number(revenue)} €')
 
 def main():
     """
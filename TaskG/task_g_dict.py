@@ -20,7 +20,15 @@ int | str | str | str | date | time | int | float | bool | str | datetime
 
 """
 
+from collections.abc import Callable, Iterable
 from datetime import datetime
+import os
+import sys
+# The helpers shared by the tasks (compressed_io, fi_format, ...) are in ../shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+from compressed_io import open_text
+from quarantine import ROW_ERRORS, Quarantine
+from fi_format import format_date, format_number, format_time
 
 
 def convert_reservation_data(reservation: list) -> dict:
@@ -50,23 +58,30 @@ def convert_reservation_data(reservation: list) -> dict:
     return converted
 
 
-def fetch_reservations(reservation_file: str) -> list[dict]:
+def fetch_reservations(reservation_file: str, quarantine: Quarantine = None) -> list[dict]:
     """
     Reads reservations from a file and returns the reservations converted
     You don't need to modify this function!
 
     Parameters:
      reservation_file (str): Name of the file containing the reservations
+     quarantine (Quarantine): Lenient mode, bad rows are written here instead of raising
 
     Returns:
      reservations (list): Read and converted reservations
     """
     reservations: list[dict] = []
-    with open(reservation_file, "r", encoding="utf-8") as f:
-        for line in f:
+    with open_text(reservation_file, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
             if len(line) > 1:
                 fields = line.split("|")
-                reservations.append(convert_reservation_data(fields))
+                try:
+                    reservations.append(convert_reservation_data(fields))
+                except ROW_ERRORS as e:
+                    # Lenient mode: set the row aside and continue
+                    if quarantine is None:
+                        raise
+                    quarantine.add(line_number, line, e)
     return reservations
 
 def confirmed_reservations(reservations: list[dict]) -> None:
@@ -78,7 +93,7 @@ def confirmed_reservations(reservations: list[dict]) -> None:
     """
     for reservation in reservations:
         if reservation["confirmed"]: # If confirmed
-            print(f'- {reservation["name"]}, {reservation["resource"]}, {reservation["date"].strftime("%d.%m.%Y")} at {reservation["time"].strftime("%H.%M")}')
+            print(f'- {reservation["name"]}, {reservation["resource"]}, {format_date(reservation["date"])} at {format_time(reservation["time"])}')
 
 def long_reservations(reservations : list[dict]) -> None:
     """
@@ -89,7 +104,7 @@ def long_reservations(reservations : list[dict]) -> None:
     """
     for reservation in reservations:
         if reservation["duration"] >= 3: # If long
-            print(f'- {reservation["name"]}, {reservation["date"].strftime("%d.%m.%Y")} at {reservation["time"].strftime("%H.%M")}, duration {reservation["duration"]} h, {reservation["resource"]}')
+            print(f'- {reservation["name"]}, {format_date(reservation["date"])} at {format_time(reservation["time"])}, duration {reservation["duration"]} h, {reservation["resource"]}')
 
 
 def confirmation_statuses(reservations: list[dict]) -> None:
@@ -105,42 +120,75 @@ def confirmation_statuses(reservations: list[dict]) -> None:
 
         print(f'{name} → {"Confirmed" if confirmed else "NOT Confirmed"}')
 
-def confirmation_summary(reservations: list[dict]) -> None:
+def tally(reservations: list[dict]) -> dict:
+    """
+    Counts what the summary reports need in one pass, so a stream of reservations works too
+
+    Parameters:
+     reservations (list): Reservations
+
+    Returns:
+     counts (dict): 'total' and 'confirmed' reservations, 'revenue' from the confirmed ones
+    """
+    counts : dict = {"total": 0, "confirmed": 0, "revenue": 0.0}
+    for reservation in reservations:
+        counts["total"] += 1
+        if reservation["confirmed"]:
+            counts["confirmed"] += 1
+            counts["revenue"] += reservation["price"] * reservation["duration"]
+    return counts
+
+def confirmation_summary(reservations: list[dict], counts: dict = None) -> None:
     """
     Print confirmation summary
 
     Parameters:
      reservations (list): Reservations
+     counts (dict): Result of tally, used instead of reservations when given
     """
-    confirmed : int = len([x for x in reservations if x["confirmed"]])
-    print(f'- Confirmed reservations: {confirmed} pcs\n- Not confirmed reservations: {len(reservations) - confirmed} pcs')
+    counts = counts or tally(reservations)
+    print(f'- Confirmed reservations: {counts["confirmed"]} pcs\n- Not confirmed reservations: {counts["total"] - counts["confirmed"]} pcs')
 
-def total_revenue(reservations: list[dict]) -> None:
+def total_revenue(reservations: list[dict], counts: dict = None) -> None:
     """
     Print total revenue
 
     Parameters:
      reservations (list): Reservations
+     counts (dict): Result of tally, used instead of reservations when given
     """
-    revenue : float = sum([x["price"] * x["duration"] for x in reservations])
-    print(f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace('.', ','))
+    counts = counts or tally(reservations)
+    print(f'Total revenue from confirmed reservations: {format_number(counts["revenue"])} €')
 
-def main():
+def print_reports(reservations: list[dict] | Callable[[], Iterable[dict]]) -> None:
     """
-    Prints reservation information according to requirements
-    Reservation-specific printing is done in functions
+    Prints all five reservation reports
+
+    Parameters:
+     reservations (list or callable): Reservations, or a function returning a new
+      iterator of them for each pass (e.g. re-reading a sorted run file)
     """
-    reservations = fetch_reservations("reservations.txt")
+    stream: Callable[[], Iterable[dict]] = reservations if callable(reservations) else lambda: reservations
     print("1) Confirmed Reservations")
-    confirmed_reservations(reservations)
+    confirmed_reservations(stream())
     print("2) Long Reservations (≥ 3 h)")
-    long_reservations(reservations)
+    long_reservations(stream())
     print("3) Reservation Confirmation Status")
-    confirmation_statuses(reservations)
+    confirmation_statuses(stream())
+    # Reports 4 and 5 need no order, they share one pass
+    counts : dict = tally(stream())
     print("4) Confirmation Summary")
-    confirmation_summary(reservations)
+    confirmation_summary(None, counts)
     print("5) Total Revenue from Confirmed Reservations")
-    total_revenue(reservations)
+    total_revenue(None, counts)
+
+def main():
+    """
+    Prints reservation information according to requirements
+    Reservation-specific printing is done in functions
+    """
+    reservations = fetch_reservations("reservations.txt")
+    print_reports(reservations)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,68 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+# License: MIT
+"""
+Startup time budget of cli.py.
+
+Starts the CLI in fresh interpreters for --help of every subcommand and for
+a small reservation report, and fails (exit code 1) if the median wall time
+is over BUDGET_MS or if NumPy was imported where it is not needed.
+
+Run: python bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT: str = os.path.dirname(os.path.abspath(__file__))
+# Median milliseconds allowed per start, interpreter start included
+BUDGET_MS: float = 150.0
+COMMANDS: list[list[str]] = [
+    ['--help'],
+    ['reservations', '--help'],
+    ['diff', '--help'],
+    ['ingest', '--help'],
+    ['weekly', '--help'],
+    ['yearly', '--help'],
+    ['reservations', os.path.join(ROOT, 'TaskG', 'reservations.txt')],
+]
+# Prints whether numpy got imported after running the CLI in the same process
+NUMPY_CHECK: str = ("import sys, contextlib, io; sys.argv = ['cli.py'] + sys.argv[1:]; import cli\n"
+                    "with contextlib.redirect_stdout(io.StringIO()):\n"
+                    "    try: cli.main()\n"
+                    "    except SystemExit: pass\n"
+                    "print('numpy' in sys.modules)")
+
+def median_ms(argv: list[str], runs: int) -> float:
+    """Median wall time in milliseconds of running argv."""
+    times: list[float] = []
+    for _ in range(runs):
+        start: float = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def imports_numpy(command: list[str]) -> bool:
+    """Tells if running the CLI with the arguments imports NumPy."""
+    result = subprocess.run([sys.executable, '-c', NUMPY_CHECK] + command, cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().endswith('True')
+
+def main() -> None:
+    """Prints the timings and exits with 1 if the budget is broken."""
+    runs: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    baseline: float = median_ms([sys.executable, '-c', 'pass'], runs)
+    print(f'python -c pass: {baseline:.0f} ms')
+    failed: bool = False
+    for command in COMMANDS:
+        ms: float = median_ms([sys.executable, os.path.join(ROOT, 'cli.py')] + command, runs)
+        numpy: bool = imports_numpy(command)
+        over: bool = ms > BUDGET_MS or numpy
+        failed |= over
+        print(f"{'FAIL' if over else 'ok  '} {' '.join(command)[-50:]:50} {ms:6.0f} ms{'  imports numpy' if numpy else ''}")
+    print(f'budget {BUDGET_MS:.0f} ms')
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
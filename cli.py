@@ -0,0 +1,298 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+# License: MIT
+"""
+One command line entry point for the reservation and energy reports.
+
+  python cli.py reservations TaskG/reservations.txt [--where QUERY] [--sort date] [--dedup] [--preview]
+  python cli.py diff yesterday.txt today.txt [--merge-join]
+  python cli.py ingest nightly.txt.gz clean.txt [--lenient quarantine.txt] [--checkpoint clean.txt.checkpoint]
+  python cli.py weekly 'TaskE/week*.csv' [--merge] [--net | --bucket week] [--output summary.txt]
+  python cli.py yearly TaskF/2025.csv [--month 5 | --start 01.03.2025 --end 10.03.2025 | --bucket hour-of-day] [--preview]
+                       [--prices spot.csv [--tariff tariff.json]]
+
+Paths may be globs. Only argparse is imported at startup: each subcommand
+imports its task folder (and NumPy, where needed) when it runs, so the
+other commands and --help stay fast (see bench_startup.py).
+"""
+import argparse
+import glob
+import os
+import sys
+
+ROOT: str = os.path.dirname(os.path.abspath(__file__))
+# Same as resample.BUCKETS, kept here so --help does not import NumPy
+BUCKETS: list[str] = ['15min', 'hour', 'day', 'week', 'month', 'hour-of-day']
+
+def use_folder(folder: str) -> None:
+    """Makes the modules of one task folder, and the helpers in shared/, importable."""
+    sys.path.insert(0, os.path.join(ROOT, 'shared'))
+    sys.path.insert(0, os.path.join(ROOT, folder))
+
+def expand(patterns: list[str]) -> list[str]:
+    """Expands globs, keeping the given order and plain names that match nothing (so open reports them)."""
+    paths: list[str] = []
+    for pattern in patterns:
+        matches: list[str] = sorted(glob.glob(pattern))
+        paths += matches if matches else [pattern]
+    return paths
+
+def run_reservations(args: argparse.Namespace) -> None:
+    """Prints the five reservation reports of TaskG for the given files."""
+    use_folder('TaskG')
+    from task_g_dict import fetch_reservations, print_reports
+    from quarantine import Quarantine
+    paths: list[str] = expand(args.paths)
+    if args.preview:
+        from preview import print_preview, progressive_preview
+        for path in paths:
+            for preview in progressive_preview(path):
+                print_preview(preview)
+        return
+    quarantine: Quarantine = Quarantine(args.lenient) if args.lenient else None
+    # Parsed in main(), so a bad --where is a usage error
+    query = args.query
+    if args.dedup:
+        from dedup import unique_reservations
+        reservations: list[dict] = [r for path in paths for r in unique_reservations(path, quarantine, args.expected_rows)]
+        if args.sort:
+            from external_sort import SORT_KEYS
+            reservations.sort(key=SORT_KEYS[args.sort])
+    elif args.sort:
+        import tempfile
+        from external_sort import read_run, sort_to_run
+        # Sorted once into one run file, every report pass re-reads it
+        with tempfile.TemporaryDirectory() as folder:
+            run: str = sort_to_run(paths, args.sort, folder, quarantine=quarantine)
+            if quarantine is not None:
+                quarantine.close()
+
+            def stream():
+                """The sorted reservations, read again from the run file"""
+                return filter(query.function, read_run(run, keep=True)) if query else read_run(run, keep=True)
+            print_reports(stream)
+        return
+    else:
+        reservations = [r for path in paths for r in fetch_reservations(path, quarantine)]
+    if quarantine is not None:
+        quarantine.close()
+    if query:
+        reservations = query.filter(reservations)
+    print_reports(reservations)
+
+def run_diff(args: argparse.Namespace) -> None:
+    """Prints what changed between two reservation snapshots."""
+    use_folder('TaskG')
+    from snapshot_diff import diff_snapshots, print_diff
+    print_diff(diff_snapshots(args.old, args.new, True if args.merge_join else None))
+
+def run_ingest(args: argparse.Namespace) -> None:
+    """Converts a reservation file into a clean copy in committed batches, resuming after a failure."""
+    use_folder('TaskG')
+    from booking_writer import format_reservation
+    from quarantine import Quarantine, ingest, load_checkpoint
+    from task_g_dict import convert_reservation_data
+    checkpoint: str = args.checkpoint or args.target + '.checkpoint'
+    resumed: int = load_checkpoint(checkpoint)
+    quarantine: Quarantine = Quarantine(args.lenient) if args.lenient else None
+    # A fresh run starts the copy over, a resumed one appends after the committed batches. A batch
+    # interrupted between its write and the checkpoint is written again, --dedup removes the repeats.
+    with open(args.target, 'a' if resumed else 'w', encoding='utf-8') as target:
+
+        def commit(lines: list[str]) -> None:
+            """Writes one batch durably before ingest moves the checkpoint past it."""
+            target.write(''.join(lines))
+            target.flush()
+            os.fsync(target.fileno())
+
+        try:
+            lines: int = ingest(args.source, lambda line: format_reservation(convert_reservation_data(line.split('|'))),
+                                commit, checkpoint, args.batch_size, quarantine)
+        finally:
+            if quarantine is not None:
+                quarantine.close()
+    print(f'{args.target}: {lines - resumed} lines read' + (f' after line {resumed}' if resumed else '')
+          + (f', {quarantine.count} quarantined in {args.lenient}' if quarantine and quarantine.count else ''))
+
+def run_weekly(args: argparse.Namespace) -> None:
+    """Builds the TaskE weekly summary for the given files."""
+    use_folder('TaskE')
+    import task_e
+    paths: list[str] = expand(args.paths)
+    if args.bucket:
+        from compressed_io import open_text
+        from resample import report_tables, series_from_rows, table_lines
+        from task_e import merge_data, stream_data
+        rows = merge_data(paths) if args.merge else (row for path in paths for row in stream_data(path))
+        with open_text(paths[0]) as f:
+            fields: list[str] = f.readline().rstrip('\n').split(';')
+        table: dict = report_tables(series_from_rows(rows), fields[1:], buckets=[args.bucket])[args.bucket]
+        summary: str = '\n'.join(table_lines(table, args.bucket, fields)) + '\n'
+    elif args.merge or args.net:
+        from compressed_io import open_text
+        from task_e import merge_data, format_data, result_data, stream_data
+        rows = merge_data(paths) if args.merge else (row for path in paths for row in stream_data(path))
+        if args.net:
+            from net_metering import NET_TITLES, format_net_data
+            summary: str = result_data(NET_TITLES, format_net_data(list(rows)))
+        else:
+            with open_text(paths[0]) as f:
+                fields: list[str] = f.readline().rstrip('\n').split(';')
+            summary = result_data(fields, format_data(rows))
+    else:
+        summary = task_e.summarise(paths)
+    if args.output == '-':
+        print(summary, end='')
+    else:
+        with open(args.output, 'w') as f:
+            f.write(summary)
+
+def cost_report(path: str, args: argparse.Namespace) -> list[str]:
+    """The cost report matching a yearly report: daily range, days of --month, or months and the year."""
+    import json
+    from datetime import date
+    from cost_engine import (EXAMPLE_TARIFF, create_daily_cost_report, create_monthly_cost_report,
+                             create_yearly_cost_report, hourly_costs, read_hourly)
+    tariff: list[dict] = None
+    if args.tariff == 'example':
+        tariff = EXAMPLE_TARIFF
+    elif args.tariff:
+        with open(args.tariff, encoding='utf-8') as f:
+            tariff = json.load(f)
+    try:
+        costs: dict = hourly_costs(read_hourly(path), read_hourly(args.prices), tariff)
+    except ValueError as e:
+        sys.exit(f'{args.prices}: {e}')
+    if args.start:
+        return create_daily_cost_report(costs, args.start, args.end)
+    if args.month:
+        year: int = costs['local'][0].astype(object).year
+        end: date = date(year + 1, 1, 1) if args.month == 12 else date(year, args.month + 1, 1)
+        return create_daily_cost_report(costs, date(year, args.month, 1), end)
+    return create_monthly_cost_report(costs) + create_yearly_cost_report(costs)
+
+def run_yearly(args: argparse.Namespace) -> None:
+    """Prints one TaskF report without the menus."""
+    use_folder('TaskF')
+    from datetime import timedelta
+    from task_f import create_daily_report, create_monthly_report, create_yearly_report, read_data
+    sketches: dict = {}
+    path: str = expand([args.path])[0]
+    if args.preview:
+        from preview import progressive_summary
+        try:
+            for lines in progressive_summary(path, args.month):
+                print('\n'.join(lines))
+        except ValueError as e:
+            build_parser().error(str(e))
+        return
+    if args.bucket:
+        from resample import read_series, report_tables, table_lines
+        from compressed_io import open_text
+        with open_text(path) as f:
+            fields: list[str] = f.readline().rstrip('\n').split(';')
+        # Temperature is a daily average repeated every hour, so it is averaged, not summed
+        table: dict = report_tables(read_series(path, [1, 2, 3]), fields[1:], ['sum', 'sum', 'mean'],
+                                    [args.bucket])[args.bucket]
+        print('\n'.join(table_lines(table, args.bucket, fields)))
+        return
+    # Prices are joined first, so a price file with gaps fails before any report is printed
+    costs: list[str] = cost_report(path, args) if args.prices else []
+    data: dict = read_data(path, sketches=sketches)
+    # The end day is not included, so it may be the day after the data
+    if args.start and (args.start not in data or args.end - timedelta(days=1) not in data):
+        first, last = min(data), max(data)
+        build_parser().error(f'--start and --end must be within the data, {first:%d.%m.%Y}-{last + timedelta(days=1):%d.%m.%Y}')
+    if args.start:
+        lines: list[str] = create_daily_report(data, args.start, args.end)
+    elif args.month:
+        lines = create_monthly_report(data, sketches, args.month)
+    else:
+        lines = create_yearly_report(data, sketches)
+    print('\n'.join((lines or []) + costs))
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line arguments of every subcommand."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Reservation and energy reports')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    reservations = commands.add_parser('reservations', help='reservation reports (TaskG)')
+    reservations.add_argument('paths', nargs='+', help='reservation files or globs, may be compressed')
+    reservations.add_argument('--where', help="filter, e.g. \"confirmed and duration >= 3\"")
+    reservations.add_argument('--sort', choices=['date', 'resource', 'created'], help='sort with an external merge sort')
+    reservations.add_argument('--dedup', action='store_true', help='keep only the latest row (by createdAt) per reservationId in each file')
+    reservations.add_argument('--expected-rows', type=int, help='with --dedup, size a Bloom filter for files too large to index every row')
+    reservations.add_argument('--lenient', metavar='QUARANTINE', help='write bad rows to this file instead of stopping')
+    reservations.add_argument('--preview', action='store_true',
+                              help='estimate confirmations and revenue from growing samples before the exact totals')
+    reservations.set_defaults(run=run_reservations)
+
+    diff = commands.add_parser('diff', help='changes between two reservation snapshots (TaskG)')
+    diff.add_argument('old', help='earlier reservation file')
+    diff.add_argument('new', help='later reservation file')
+    diff.add_argument('--merge-join', action='store_true', help='sort both files on disk instead of indexing the old one in memory')
+    diff.set_defaults(run=run_diff)
+
+    ingest = commands.add_parser('ingest', help='clean copy of a reservation file, resumable after a failure (TaskG)')
+    ingest.add_argument('source', help='reservation file, may be compressed')
+    ingest.add_argument('target', help='clean reservation file to write')
+    ingest.add_argument('--lenient', metavar='QUARANTINE', help='write bad rows to this file instead of stopping')
+    ingest.add_argument('--checkpoint', metavar='FILE', help='last committed line, to resume from (default TARGET.checkpoint)')
+    ingest.add_argument('--batch-size', type=int, default=10000, help='lines per commit')
+    ingest.set_defaults(run=run_ingest)
+
+    weekly = commands.add_parser('weekly', help='weekly consumption and production summary (TaskE)')
+    weekly.add_argument('paths', nargs='+', help='weekly CSV files or globs')
+    weekly.add_argument('--merge', action='store_true', help='merge overlapping files into one table')
+    weekly.add_argument('--net', action='store_true', help='per phase net metering table (needs NumPy)')
+    weekly.add_argument('--bucket', choices=BUCKETS, help='one row per time bucket instead of per day (needs NumPy)')
+    weekly.add_argument('--output', default='summary.txt', help="output file, '-' for the console")
+    weekly.set_defaults(run=run_weekly)
+
+    yearly = commands.add_parser('yearly', help='daily range, monthly or yearly report (TaskF)')
+    yearly.add_argument('path', help='yearly CSV file')
+    yearly.add_argument('--month', type=int, choices=range(1, 13), metavar='1-12', help='monthly report')
+    yearly.add_argument('--start', help='daily range report start, dd.mm.yyyy')
+    yearly.add_argument('--end', help='daily range report end, dd.mm.yyyy')
+    yearly.add_argument('--bucket', choices=BUCKETS, help='table of every bucket instead of a summary (needs NumPy)')
+    yearly.add_argument('--preview', action='store_true',
+                        help='estimate the yearly (or --month) summary from growing samples before the exact one')
+    yearly.add_argument('--prices', metavar='FILE', help='hourly spot prices in c/kWh (2025.csv format), adds the matching cost report')
+    yearly.add_argument('--tariff', metavar='FILE', help="with --prices, time-of-use rules as JSON (see cost_engine.py), or 'example'")
+    yearly.set_defaults(run=run_yearly)
+    return parser
+
+def main(argv: list[str] = None) -> None:
+    """Parses the command line and runs the subcommand."""
+    args: argparse.Namespace = build_parser().parse_args(argv)
+    if args.command == 'yearly' and bool(args.start) != bool(args.end):
+        build_parser().error('--start and --end go together')
+    if args.command == 'yearly' and args.start:
+        from datetime import datetime
+        try:
+            args.start = datetime.strptime(args.start, '%d.%m.%Y').date()
+            args.end = datetime.strptime(args.end, '%d.%m.%Y').date()
+        except ValueError:
+            build_parser().error('--start and --end are dates as dd.mm.yyyy')
+        # The end day is not included, so the range must have at least one day
+        if args.end <= args.start:
+            build_parser().error('--end must be after --start')
+    args.query = None
+    if args.command == 'reservations' and args.where:
+        use_folder('TaskG')
+        from query import Query
+        try:
+            args.query = Query(args.where)
+        except ValueError as e:
+            build_parser().error(f'--where: {e}')
+    if args.command == 'reservations' and args.preview and (args.where or args.sort or args.dedup):
+        build_parser().error('--preview does not combine with --where, --sort or --dedup')
+    if args.command == 'yearly' and args.preview and (args.start or args.bucket):
+        build_parser().error('--preview works for the yearly or --month summary only')
+    if args.command == 'yearly' and args.prices and (args.preview or args.bucket):
+        build_parser().error('--prices does not combine with --preview or --bucket')
+    if args.command == 'yearly' and args.tariff and not args.prices:
+        build_parser().error('--tariff needs --prices')
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+from collections.abc import Callable
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+
+# Decompressed bytes handed over from the worker thread at a time
+CHUNK_SIZE: int = 1 << 20
+# How many chunks may wait in the queue before the worker blocks
+QUEUE_CHUNKS: int = 8
+
+# Magic bytes at the start of each supported compressed file
+OPENERS: dict[bytes, Callable] = {
+    b'\x1f\x8b': gzip.open,
+    b'BZh': bz2.open,
+    b'\xfd7zXZ\x00': lzma.open,
+}
+
+def detect_opener(filename: str) -> Callable | None:
+    """Returns the open function of the file's compression format, or None for plain files."""
+    with open(filename, 'rb') as f:
+        head: bytes = f.read(6)
+    for magic, opener in OPENERS.items():
+        if head.startswith(magic):
+            return opener
+    return None
+
+class ThreadedDecompressor(io.RawIOBase):
+    """
+    Binary stream that decompresses a file in a background thread.
+
+    The worker fills a bounded queue with chunks while the reader parses the
+    previous ones, so decompression and parsing overlap but memory stays at
+    QUEUE_CHUNKS * CHUNK_SIZE.
+    """
+
+    def __init__(self, filename: str, opener: Callable):
+        super().__init__()
+        self.chunks: queue.Queue = queue.Queue(maxsize=QUEUE_CHUNKS)
+        self.stop: threading.Event = threading.Event()
+        self.buffer: memoryview = memoryview(b'')
+        self.finished: bool = False
+        self.worker: threading.Thread = threading.Thread(target=self._decompress, args=(filename, opener), daemon=True)
+        self.worker.start()
+
+    def _put(self, item) -> None:
+        """Puts an item in the queue unless the reader has closed the stream."""
+        while not self.stop.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _decompress(self, filename: str, opener: Callable) -> None:
+        """Worker thread: reads decompressed chunks into the queue, None marks the end."""
+        try:
+            with opener(filename, 'rb') as f:
+                while not self.stop.is_set():
+                    chunk: bytes = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self._put(chunk)
+        except Exception as e:
+            # Raised again in the reading thread
+            self._put(e)
+        self._put(None)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if not self.buffer:
+            if self.finished:
+                return 0
+            item = self.chunks.get()
+            if item is None:
+                self.finished = True
+                return 0
+            if isinstance(item, Exception):
+                self.finished = True
+                raise item
+            self.buffer = memoryview(item)
+        size: int = min(len(b), len(self.buffer))
+        b[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self.stop.set()
+            # Free the worker if it is waiting on a full queue
+            while self.worker.is_alive():
+                try:
+                    self.chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        super().close()
+
+def open_text(filename: str, encoding: str | None = None, newline: str | None = None) -> io.TextIOBase:
+    """
+    Opens a plain, .gz, .bz2 or .xz file for reading as text.
+    The format is detected from the file contents, not the name.
+    """
+    opener: Callable | None = detect_opener(filename)
+    if opener is None:
+        return open(filename, 'r', encoding=encoding, newline=newline)
+    raw: ThreadedDecompressor = ThreadedDecompressor(filename, opener)
+    return io.TextIOWrapper(io.BufferedReader(raw, CHUNK_SIZE), encoding=encoding, newline=newline)
@@ -0,0 +1,137 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+from collections.abc import Iterable
+from datetime import date, time, timedelta
+import math
+
+# Finnish weekday names, Monday first as in date.weekday()
+WEEKDAYS: list[str] = ["Maanantai", "Tiistai", "Keskiviikko", "Torstai", "Perjantai", "Lauantai", "Sunnuntai"]
+
+# Formatted strings of days and times already seen, reports repeat the same few hundred days
+_dates: dict[date, str] = {}
+_weekdays: dict[date, str] = {}
+_times: dict[time, str] = {}
+# Formatted numbers already seen, prices repeat in every row. Cleared when full, as totals seldom repeat
+_numbers: dict[tuple[float, int], str] = {}
+NUMBER_CACHE_SIZE: int = 65536
+
+def precompute_dates(first: date, last: date) -> None:
+    """
+    Fills the date caches for every day from first to last
+
+    :first: First day
+    :last: Last day (inclusive)
+    """
+    day: date = first
+    while day <= last:
+        format_date(day)
+        format_weekday(day)
+        day += timedelta(days=1)
+
+def format_date(day: date) -> str:
+    """
+    Returns the day as dd.mm.yyyy, same as strftime("%d.%m.%Y")
+
+    :day: Day to format
+    :returns: Formatted date
+    """
+    text: str = _dates.get(day)
+    if text is None:
+        text = _dates[day] = f"{day.day:02d}.{day.month:02d}.{day.year:04d}"
+    return text
+
+def format_weekday(day: date) -> str:
+    """
+    Returns the Finnish name of the weekday
+
+    :day: Day to format
+    :returns: Weekday name
+    """
+    text: str = _weekdays.get(day)
+    if text is None:
+        text = _weekdays[day] = WEEKDAYS[day.weekday()]
+    return text
+
+def format_time(moment: time) -> str:
+    """
+    Returns the time as hh.mm, same as strftime("%H.%M")
+
+    :moment: Time to format
+    :returns: Formatted time
+    """
+    text: str = _times.get(moment)
+    if text is None:
+        text = _times[moment] = f"{moment.hour:02d}.{moment.minute:02d}"
+    return text
+
+def format_number(value: float, decimals: int = 2) -> str:
+    """
+    Returns the number with a decimal comma, same as f"{value:.2f}".replace(".", ",")
+
+    The digits are rendered from the exact binary value with integer arithmetic,
+    rounding half to even like the f-string, so no decimal point is ever made.
+
+    :value: Number to format
+    :decimals: Number of decimals
+    :returns: Formatted number
+    """
+    # 0.0 and -0.0 are the same key but print differently, zeros are not cached
+    text: str = _numbers.get((value, decimals)) if value else None
+    if text is not None:
+        return text
+    if not math.isfinite(value):
+        return f"{value:.{decimals}f}"
+    numerator, denominator = float(value).as_integer_ratio()
+    scaled, rest = divmod(abs(numerator) * 10 ** decimals, denominator)
+    if 2 * rest > denominator or (2 * rest == denominator and scaled & 1):
+        scaled += 1
+    # -0.001 prints as -0,00 like the f-string
+    sign: str = "-" if math.copysign(1.0, value) < 0 else ""
+    if decimals:
+        whole, fraction = divmod(scaled, 10 ** decimals)
+        text = f"{sign}{whole},{fraction:0{decimals}d}"
+    else:
+        text = f"{sign}{scaled}"
+    if len(_numbers) >= NUMBER_CACHE_SIZE:
+        _numbers.clear()
+    if value:
+        _numbers[(value, decimals)] = text
+    return text
+
+def format_rows(rows: Iterable[Iterable[float]], decimals: int = 2, separator: str = "\t") -> list[str]:
+    """
+    Formats a whole table of numbers with decimal commas at once
+
+    All cells are formatted in one join and the decimal points of the whole
+    table are swapped in a single replace, instead of one replace per cell.
+
+    :rows: Rows of numbers
+    :decimals: Number of decimals
+    :separator: Text between cells of a row
+    :returns: One string per row
+    """
+    cell = f"{{:.{decimals}f}}".format
+    text: str = "\n".join([separator.join(map(cell, row)) for row in rows])
+    if not text:
+        return []
+    return text.replace(".", ",").split("\n")
+
+def format_column(values: Iterable[float], decimals: int = 2) -> list[str]:
+    """
+    Formats a column of numbers with decimal commas at once
+
+    :values: Numbers
+    :decimals: Number of decimals
+    :returns: One string per number
+    """
+    cell = f"{{:.{decimals}f}}".format
+    text: str = "\n".join(map(cell, values))
+    if not text:
+        return []
+    return text.replace(".", ",").split("\n")
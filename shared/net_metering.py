@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Luukas Kola and Luka Hietala
+# License: MIT
+from datetime import datetime
+import numpy as np
+
+# Column titles for the net metering table, same layout as the CSV header
+NET_TITLES: list[str] = [
+    "Aika",
+    "Osto vaihe 1 kWh", "Osto vaihe 2 kWh", "Osto vaihe 3 kWh",
+    "Myynti vaihe 1 kWh", "Myynti vaihe 2 kWh", "Myynti vaihe 3 kWh",
+    "Oma käyttö vaihe 1 kWh", "Oma käyttö vaihe 2 kWh", "Oma käyttö vaihe 3 kWh",
+    "Epäsymmetria kWh",
+]
+# Keys of the daily dictionaries, in the same order as NET_TITLES[1:]
+NET_KEYS: list[str] = ["I1", "I2", "I3", "E1", "E2", "E3", "S1", "S2", "S3", "IMB"]
+
+def rows_to_arrays(rows: list[list[str]]) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Converts rows produced by read_data into NumPy arrays
+
+    :rows: List of data produced by read_data
+    :returns:
+        :hours: Timestamps as datetime64[h], shape (hours,)
+        :consumption: Consumption per phase in kWh, shape (hours, 3)
+        :production: Production per phase in kWh, shape (hours, 3)
+    """
+    hours: np.ndarray = np.array([row[0] for row in rows], dtype="datetime64[h]")
+    values: np.ndarray = np.array([row[1:7] for row in rows], dtype=np.float64) / 1000
+    return hours, values[:, 0:3], values[:, 3:6]
+
+def net_phases(consumption: np.ndarray, production: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Nets consumption against production hour by hour on each phase
+
+    Works on any leading shape, so a stack of meters (meters, hours, 3)
+    is netted in one go just like a single meter (hours, 3).
+
+    :consumption: Consumption per phase in kWh, last axis is the phase
+    :production: Production per phase in kWh, last axis is the phase
+    :returns: Dictionary with arrays
+        :import: Energy bought from the grid per phase
+        :export: Energy sold to the grid per phase
+        :self: Own production used on the same phase
+        :imbalance: Difference between the most and least loaded phase
+    """
+    net: np.ndarray = consumption - production
+    imported: np.ndarray = np.maximum(net, 0)
+    return {
+        "import": imported,
+        "export": np.maximum(-net, 0),
+        "self": np.minimum(consumption, production),
+        "imbalance": imported.max(axis=-1) - imported.min(axis=-1),
+    }
+
+def daily_sums(hours: np.ndarray, values: np.ndarray, axis: int = -2) -> (np.ndarray, np.ndarray):
+    """
+    Sums hourly values into days
+
+    :hours: Timestamps as datetime64[h] in any order, shape (hours,)
+    :values: Hourly values, e.g. (meters, hours, 3) or (hours, columns)
+    :axis: The hour axis of values, -1 for (meters, hours) arrays
+    :returns:
+        :days: Days as datetime64[D], ascending
+        :sums: Values summed per day along the hour axis
+    """
+    days: np.ndarray = hours.astype("datetime64[D]")
+    # reduceat needs each day in one run, files may come in any order
+    order: np.ndarray = np.argsort(days, kind="stable")
+    unique_days, starts = np.unique(days[order], return_index=True)
+    return unique_days, np.add.reduceat(np.take(values, order, axis=axis), starts, axis=axis)
+
+def format_net_data(rows: list[list[str]]) -> dict[datetime.date, dict[str, float]]:
+    """
+    Does net metering calculations and formats csv data into dictionary
+
+    :rows: List of data produced by read_data, in any order
+    :returns: Dictionary which maps days to dictionaries, which map
+    NET_KEYS into float values, ready for print_data / result_data
+    """
+    hours, consumption, production = rows_to_arrays(rows)
+    netted: dict[str, np.ndarray] = net_phases(consumption, production)
+    # One (hours, 10) table, columns in NET_KEYS order
+    table: np.ndarray = np.column_stack((netted["import"], netted["export"], netted["self"], netted["imbalance"]))
+    days, sums = daily_sums(hours, table)
+    results: dict[datetime.date, dict[str, float]] = {}
+    for day, values in zip(days.tolist(), sums.tolist()):
+        results[day] = dict(zip(NET_KEYS, values))
+    return results
@@ -0,0 +1,144 @@
+# Copyright (c) 2026 Ville Heikkiniemi, Luka Hietala, Luukas Kola
+#
+# This code is licensed under the MIT License.
+# You are free to use, modify, and distribute this code,
+# provided that the original copyright notice is retained.
+#
+# See LICENSE file in the project root for full license information.
+
+"""
+Error tolerant reading: rows that fail to convert are written to a
+quarantine file with their line number and the reason, and long ingests
+can continue from the last committed line after a failure.
+
+Quarantine file format, one bad row per line:
+
+lineNumber | reason | original line
+"""
+
+from collections.abc import Callable
+import os
+from compressed_io import open_text
+
+# Errors raised by int(), float(), strptime() and indexing missing columns
+ROW_ERRORS: tuple = (ValueError, IndexError, TypeError)
+
+
+class Quarantine:
+    """Appends bad rows to a quarantine file, opened on the first bad row"""
+
+    def __init__(self, filename: str = "quarantine.txt"):
+        self.filename = filename
+        self.file = None
+        self.count = 0
+
+    def add(self, line_number: int, line: str, reason: Exception) -> None:
+        """
+        Writes one bad row to the quarantine file
+
+        Parameters:
+         line_number (int): Line number in the source file, first line is 1
+         line (str): The original line
+         reason (Exception): Why the row could not be converted
+        """
+        if self.file is None:
+            self.file = open(self.filename, "a", encoding="utf-8")
+        message: str = f"{type(reason).__name__}: {reason}".replace("|", "/").replace("\n", " ")
+        self.file.write(f"{line_number}|{message}|{line.rstrip()}\n")
+        self.count += 1
+
+    def flush(self) -> None:
+        """Writes the bad rows added so far to disk, before a checkpoint moves past them"""
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        """Closes the quarantine file"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_checkpoint(checkpoint_file: str) -> int:
+    """
+    Returns the number of lines already committed, 0 if there is no checkpoint
+
+    Parameters:
+     checkpoint_file (str): Name of the checkpoint file
+    """
+    if not os.path.exists(checkpoint_file):
+        return 0
+    with open(checkpoint_file, "r", encoding="utf-8") as f:
+        return int(f.read().strip() or 0)
+
+
+def save_checkpoint(checkpoint_file: str, line_number: int) -> None:
+    """
+    Stores the last committed line number, atomically so a crash keeps the old one
+
+    Parameters:
+     checkpoint_file (str): Name of the checkpoint file
+     line_number (int): Lines up to and including this one are committed
+    """
+    temporary: str = checkpoint_file + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(f"{line_number}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, checkpoint_file)
+
+
+def ingest(data_file: str, convert: Callable, commit: Callable, checkpoint_file: str,
+           batch_size: int = 10000, quarantine: Quarantine = None, skip_lines: int = 0) -> int:
+    """
+    Converts a file in batches and commits each batch before moving the checkpoint
+
+    If a previous run failed, the lines up to its checkpoint are skipped without
+    converting them. The checkpoint file is removed once the whole file is done.
+    Bad rows after the last checkpoint of a failed run are quarantined again on
+    resume, their line numbers tell the duplicates apart.
+
+    Parameters:
+     data_file (str): File to read, may be compressed
+     convert (Callable): Converts one line (str) into a row
+     commit (Callable): Stores a list of converted rows, e.g. writes them to a database
+     checkpoint_file (str): Where the last committed line number is kept
+     batch_size (int): Lines per commit
+     quarantine (Quarantine): Where bad rows go, None to stop on the first bad row
+     skip_lines (int): Header lines at the start of the file
+
+    Returns:
+     line_number (int): Number of lines read
+    """
+    committed: int = max(load_checkpoint(checkpoint_file), skip_lines)
+    batch: list = []
+    line_number: int = 0
+    with open_text(data_file, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if line_number <= committed or not line.strip():
+                continue
+            try:
+                batch.append(convert(line))
+            except ROW_ERRORS as e:
+                if quarantine is None:
+                    raise
+                quarantine.add(line_number, line, e)
+            if line_number - committed >= batch_size:
+                commit(batch)
+                # A resumed run skips the lines before the checkpoint, so their bad rows must be on disk
+                if quarantine is not None:
+                    quarantine.flush()
+                save_checkpoint(checkpoint_file, line_number)
+                committed = line_number
+                batch = []
+    commit(batch)
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    return line_number
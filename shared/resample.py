@@ -0,0 +1,172 @@
+# Copyright (c) 2025 Luukas Kola and Luka Hietala
+# License: MIT
+"""
+Resampling of hourly (or finer) meter data into arbitrary time buckets.
+
+Timestamps are parsed once into UTC minutes and UTC offsets in minutes, and
+every bucket is an integer key computed from them:
+
+  15min, hour   UTC minutes // width, so the hour repeated when DST ends stays two buckets
+  day, week     local days since 1970-01-01, weeks start on Monday
+  month         local months since 1970-01
+  hour-of-day   local hour 0-23
+
+Values are reduced per key with NumPy ufunc.reduceat after one stable sort,
+so one parsed series fills the tables of every bucket (see report_tables).
+Files without an offset (TaskD/TaskE) are treated as local time and their
+15min and hour labels stay naive.
+"""
+from datetime import date, timedelta, timezone
+import numpy as np
+from compressed_io import open_text
+from fi_format import format_rows
+
+# Width in minutes of the buckets keyed on UTC
+FIXED_BUCKETS: dict[str, int] = {'15min': 15, 'hour': 60}
+BUCKETS: list[str] = ['15min', 'hour', 'day', 'week', 'month', 'hour-of-day']
+REDUCTIONS: list[str] = ['sum', 'mean', 'min', 'max', 'count']
+
+def parse_times(stamps: list[str]) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Parses ISO timestamps, with or without a +hh:mm offset, into UTC minutes,
+    offset minutes (both int64 arrays) and whether each had an offset (bool array).
+    """
+    local: np.ndarray = np.array([stamp[:19] for stamp in stamps], dtype='datetime64[m]').astype(np.int64)
+    offsets: np.ndarray = np.zeros(len(stamps), dtype=np.int64)
+    aware: np.ndarray = np.zeros(len(stamps), dtype=bool)
+    for i, stamp in enumerate(stamps):
+        # 2025-01-01T00:00:00.000+02:00 -> 120, naive timestamps keep 0
+        if len(stamp) > 19 and stamp[-6] in '+-':
+            minutes: int = int(stamp[-5:-3]) * 60 + int(stamp[-2:])
+            offsets[i] = -minutes if stamp[-6] == '-' else minutes
+            aware[i] = True
+    return local - offsets, offsets, aware
+
+def read_series(filename: str, columns: list[int], scale: float = 1.0) -> dict[str, np.ndarray]:
+    """Reads the given value columns of a ';' separated file with decimal commas into a series."""
+    stamps: list[str] = []
+    values: list[list[str]] = []
+    with open_text(filename) as f:
+        # Skip header
+        next(f)
+        for line in f:
+            fields: list[str] = line.rstrip('\n').split(';')
+            if len(fields) < 2:
+                continue
+            stamps.append(fields[0].strip())
+            values.append([fields[column].replace(',', '.') for column in columns])
+    return make_series(stamps, values, scale)
+
+def series_from_rows(rows: list[list[str]], columns: list[int] = range(1, 7), scale: float = 1 / 1000) -> dict[str, np.ndarray]:
+    """Builds a series from rows of read_data or merge_data (TaskD/TaskE, Wh into kWh by default)."""
+    rows = list(rows)
+    return make_series([row[0] for row in rows], [[row[column] for column in columns] for row in rows], scale)
+
+def make_series(stamps: list[str], values: list[list[str]], scale: float) -> dict[str, np.ndarray]:
+    """Series of UTC minutes, offsets, offset given or not and a (rows, columns) value array."""
+    series: dict[str, np.ndarray] = {}
+    series['utc'], series['offset'], series['aware'] = parse_times(stamps)
+    series['values'] = np.array(values, dtype=np.float64).reshape(len(stamps), -1) * scale
+    return series
+
+def bucket_keys(series: dict[str, np.ndarray], bucket: str) -> np.ndarray:
+    """Integer key of every row for the bucket."""
+    if bucket in FIXED_BUCKETS:
+        return series['utc'] // FIXED_BUCKETS[bucket]
+    local: np.ndarray = series['utc'] + series['offset']
+    days: np.ndarray = local // 1440
+    match bucket:
+        case 'day':
+            return days
+        case 'week':
+            # 1970-01-01 was a Thursday, shift so weeks start on Monday
+            return (days + 3) // 7
+        case 'month':
+            return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        case 'hour-of-day':
+            return local // 60 % 24
+    raise ValueError(f'Unknown bucket {bucket}, use one of {", ".join(BUCKETS)}')
+
+def bucket_labels(keys: np.ndarray, offsets: np.ndarray, bucket: str, aware: np.ndarray = None) -> np.ndarray:
+    """
+    Local start of every bucket: datetime64 days or months, datetimes for 15min
+    and hour (timezone aware where aware is set, as the repeated hour in autumn
+    differs only by its offset), or the hour number for hour-of-day.
+    """
+    if bucket in FIXED_BUCKETS:
+        starts: list = (keys * FIXED_BUCKETS[bucket] + offsets).astype('datetime64[m]').tolist()
+        if aware is None:
+            aware = np.ones(len(keys), dtype=bool)
+        zones: dict[int, timezone] = {offset: timezone(timedelta(minutes=offset)) for offset in set(offsets.tolist())}
+        return np.array([start.replace(tzinfo=zones[offset]) if given else start
+                         for start, offset, given in zip(starts, offsets.tolist(), aware.tolist())], dtype=object)
+    match bucket:
+        case 'day':
+            return keys.astype('datetime64[D]')
+        case 'week':
+            return (keys * 7 - 3).astype('datetime64[D]')
+        case 'month':
+            return keys.astype('datetime64[M]')
+    return keys
+
+def resample(series: dict[str, np.ndarray], bucket: str, how: str | list[str] = 'sum') -> (np.ndarray, np.ndarray):
+    """
+    Reduces the values of a series per bucket. how is one of REDUCTIONS for
+    every column or a list with one per column.
+
+    Returns bucket labels (see bucket_labels) and a (buckets, columns) array.
+    """
+    keys: np.ndarray = bucket_keys(series, bucket)
+    order: np.ndarray = np.argsort(keys, kind='stable')
+    groups, starts = np.unique(keys[order], return_index=True)
+    values: np.ndarray = series['values'][order]
+    counts: np.ndarray = np.diff(np.append(starts, len(keys)))
+    columns: int = values.shape[1]
+    reductions: list[str] = [how] * columns if isinstance(how, str) else list(how)
+    if len(reductions) != columns:
+        raise ValueError(f'{len(reductions)} reductions for {columns} columns')
+
+    result: np.ndarray = np.empty((len(groups), columns))
+    # Each reduction runs once over all the columns that use it
+    for reduction in set(reductions):
+        picked: list[int] = [i for i, r in enumerate(reductions) if r == reduction]
+        if reduction == 'count':
+            result[:, picked] = counts[:, None]
+            continue
+        if reduction not in REDUCTIONS:
+            raise ValueError(f'Unknown reduction {reduction}, use one of {", ".join(REDUCTIONS)}')
+        ufunc: np.ufunc = {'sum': np.add, 'mean': np.add, 'min': np.minimum, 'max': np.maximum}[reduction]
+        reduced: np.ndarray = ufunc.reduceat(values[:, picked], starts, axis=0)
+        result[:, picked] = reduced / counts[:, None] if reduction == 'mean' else reduced
+    first: np.ndarray = order[starts]
+    return bucket_labels(groups, series['offset'][first], bucket, series['aware'][first]), result
+
+def to_table(labels: np.ndarray, values: np.ndarray, names: list[str]) -> dict:
+    """
+    Turns resampled arrays into the dictionaries the reports use: bucket start
+    (date, datetime or hour number) -> column name -> value.
+    """
+    return {label: dict(zip(names, row)) for label, row in zip(labels.tolist(), values.tolist())}
+
+def report_tables(series: dict[str, np.ndarray], names: list[str], how: str | list[str] = 'sum',
+                  buckets: list[str] = BUCKETS) -> dict[str, dict]:
+    """Fills the table of every bucket from one parsed series."""
+    return {bucket: to_table(*resample(series, bucket, how), names) for bucket in buckets}
+
+def format_label(label: date | int, bucket: str) -> str:
+    """Formats a bucket label for a report line."""
+    match bucket:
+        case '15min' | 'hour':
+            return label.strftime('%d.%m.%Y %H:%M%z')
+        case 'day':
+            return label.strftime('%d.%m.%Y')
+        case 'week':
+            return f'Week {label.isocalendar()[1]} ({label.strftime("%d.%m.%Y")})'
+        case 'month':
+            return label.strftime('%m/%Y')
+    return f'{label:02d}:00'
+
+def table_lines(table: dict, bucket: str, titles: list[str]) -> list[str]:
+    """Formats a table from to_table as tab separated lines with decimal commas."""
+    cells: list[str] = format_rows(row.values() for row in table.values())
+    return ['\t'.join(titles)] + [f'{format_label(label, bucket)}\t{row}' for label, row in zip(table, cells)]